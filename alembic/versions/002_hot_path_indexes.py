@@ -0,0 +1,58 @@
+"""Indexes for hot filter paths.
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial index predicate)
+# Keyset-paginated listings end in id, the tie-breaker their cursors seek on
+INDEXES = [
+    ('ix_deals_owner_id_status', 'deals', ['owner_id', 'status'], None),
+    ('ix_deals_status', 'deals', ['status'], None),
+    ('ix_deals_client_id', 'deals', ['client_id'], None),
+    ('ix_proposals_status_valid_until', 'proposals', ['status', 'valid_until'], None),
+    ('ix_proposals_valid_until', 'proposals', ['valid_until'], None),
+    ('ix_proposals_owner_id_status', 'proposals', ['owner_id', 'status'], None),
+    ('ix_proposals_deal_id', 'proposals', ['deal_id'], None),
+    ('ix_proposals_client_id', 'proposals', ['client_id'], None),
+    ('ix_notifications_user_id_created_at_id', 'notifications', ['user_id', 'created_at', 'id'], None),
+    ('ix_notifications_user_id_created_at_id_unread', 'notifications', ['user_id', 'created_at', 'id'], 'read = false'),
+    ('ix_webhook_deliveries_webhook_id_created_at_id', 'webhook_deliveries', ['webhook_id', 'created_at', 'id'], None),
+    ('ix_integration_sync_logs_integration_id_started_at_id', 'integration_sync_logs', ['integration_id', 'started_at', 'id'], None),
+]
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+def upgrade():
+    # Notification, webhook and integration tables are created from the models,
+    # which declare these indexes too; only index the tables that exist already.
+    tables = _existing_tables()
+    # CONCURRENTLY keeps the tables writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            if table not in tables:
+                continue
+            op.create_index(
+                name, table, columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+def downgrade():
+    tables = _existing_tables()
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in reversed(INDEXES):
+            if table not in tables:
+                continue
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
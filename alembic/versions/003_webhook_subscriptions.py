@@ -0,0 +1,50 @@
+"""Webhook subscriptions table.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16 11:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    # Created from the models together with webhooks otherwise
+    if 'webhooks' not in tables:
+        return
+
+    # The table may exist already (create_all, an interrupted run); the
+    # backfill still has to happen
+    if 'webhook_subscriptions' not in tables:
+        op.create_table(
+            'webhook_subscriptions',
+            sa.Column('event_type', sa.String(), nullable=False),
+            sa.Column('webhook_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['webhook_id'], ['webhooks.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('event_type', 'webhook_id')
+        )
+    op.create_index(
+        'ix_webhook_subscriptions_webhook_id', 'webhook_subscriptions', ['webhook_id'],
+        if_not_exists=True
+    )
+
+    # Copy the subscribed events out of webhooks.events, keeping rows already there
+    op.execute(
+        """
+        INSERT INTO webhook_subscriptions (event_type, webhook_id)
+        SELECT DISTINCT event_type, id
+        FROM webhooks, json_array_elements_text(webhooks.events) AS event_type
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+def downgrade():
+    # webhooks.events is kept in sync, so nothing has to be copied back
+    if 'webhook_subscriptions' in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table('webhook_subscriptions')
@@ -0,0 +1,51 @@
+"""Full-text and trigram search on clients.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16 14:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+# revision identifiers
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(company, '')), 'B')"
+)
+
+# (name, column, operator class)
+INDEXES = [
+    ('ix_clients_search_vector', 'search_vector', None),
+    ('ix_clients_name_trgm', 'name', 'gin_trgm_ops'),
+    ('ix_clients_company_trgm', 'company', 'gin_trgm_ops'),
+]
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Adding a stored generated column rewrites the table once
+    op.add_column(
+        'clients',
+        sa.Column('search_vector', TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True))
+    )
+    # CONCURRENTLY keeps the table writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, column, ops in INDEXES:
+            op.create_index(
+                name, 'clients', [column],
+                postgresql_using='gin',
+                postgresql_ops={column: ops} if ops else {},
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, column, ops in reversed(INDEXES):
+            op.drop_index(name, table_name='clients', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('clients', 'search_vector')
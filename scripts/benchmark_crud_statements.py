@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of per-call statement overhead for the CRUD get_by_* helpers.
+
+Compares the legacy Query API, a select() built on every call (served by the
+compiled cache) and lambda_stmt (which also caches construction and the cache
+key). The query runs against an in-memory SQLite table with few rows, so the
+numbers are dominated by SQLAlchemy's Python-side overhead.
+"""
+
+import argparse
+import timeit
+
+from sqlalchemy import Column, Integer, String, create_engine, lambda_stmt, select
+from sqlalchemy.orm import Session, declarative_base
+
+Base = declarative_base()
+
+class Deal(Base):
+    """Subset of the deals table filtered by the hot paths."""
+    __tablename__ = "deals"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    status = Column(String)
+    owner_id = Column(Integer, index=True)
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark CRUD statement overhead')
+    parser.add_argument('--calls', '-n', type=int, default=5000,
+                      help='Calls per variant')
+    parser.add_argument('--repeat', '-r', type=int, default=5,
+                      help='Runs per variant; the fastest is reported')
+    return parser.parse_args()
+
+def query_api(db: Session, owner_id: int):
+    return db.query(Deal).filter(Deal.owner_id == owner_id).all()
+
+def select_per_call(db: Session, owner_id: int):
+    return db.execute(select(Deal).where(Deal.owner_id == owner_id)).scalars().all()
+
+def cached_lambda(db: Session, owner_id: int):
+    return db.execute(lambda_stmt(lambda: select(Deal).where(Deal.owner_id == owner_id))).scalars().all()
+
+def build_select(owner_id: int):
+    return select(Deal).where(Deal.owner_id == owner_id)._generate_cache_key()
+
+def build_lambda(owner_id: int):
+    return lambda_stmt(lambda: select(Deal).where(Deal.owner_id == owner_id))._generate_cache_key()
+
+def main():
+    args = parse_args()
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([Deal(title=f'deal {i}', status='new', owner_id=i % 100) for i in range(1000)])
+        db.commit()
+
+        print(f'{args.calls} calls, best of {args.repeat}, microseconds per call')
+        print('\nStatement construction and cache key only:')
+        for name, build in [('select()', build_select), ('lambda_stmt', build_lambda)]:
+            best = min(timeit.repeat(lambda: build(7), number=args.calls, repeat=args.repeat))
+            print(f'  {name:<14} {best / args.calls * 1e6:8.1f}')
+
+        print('\nFull get_by_owner call (10 rows):')
+        for name, call in [('db.query()', query_api), ('select()', select_per_call), ('lambda_stmt', cached_lambda)]:
+            # Objects stay in the identity map, so every variant loads the same way
+            best = min(timeit.repeat(lambda: call(db, 7), number=args.calls, repeat=args.repeat))
+            print(f'  {name:<14} {best / args.calls * 1e6:8.1f}')
+
+if __name__ == '__main__':
+    main()
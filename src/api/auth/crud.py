@@ -1,7 +1,8 @@
 """
 CRUD operations for authentication.
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
@@ -9,22 +10,24 @@ from src.api.models.database_models import User
 from src.api.auth.models import UserCreate, UserUpdate
 from src.api.auth.utils import get_password_hash, verify_password
 
-def get_user_by_username(db: Session, username: str):
+async def get_user_by_username(db: AsyncSession, username: str):
     """Get user by username."""
-    return db.query(User).filter(User.username == username).first()
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
 
-def get_user_by_email(db: Session, email: str):
+async def get_user_by_email(db: AsyncSession, email: str):
     """Get user by email."""
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
-def create_user(db: Session, user: UserCreate):
+async def create_user(db: AsyncSession, user: UserCreate):
     """Create new user."""
-    if get_user_by_email(db, user.email):
+    if await get_user_by_email(db, user.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
-    if get_user_by_username(db, user.username):
+    if await get_user_by_username(db, user.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
@@ -41,17 +44,17 @@ def create_user(db: Session, user: UserCreate):
     
     try:
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         return db_user
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Database error while creating user"
         )
 
-def update_user(db: Session, user: User, user_update: UserUpdate):
+async def update_user(db: AsyncSession, user: User, user_update: UserUpdate):
     """Update user information."""
     update_data = user_update.dict(exclude_unset=True)
     
@@ -62,31 +65,31 @@ def update_user(db: Session, user: User, user_update: UserUpdate):
         setattr(user, field, value)
     
     try:
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         return user
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Database error while updating user"
         )
 
-def authenticate_user(db: Session, username: str, password: str):
+async def authenticate_user(db: AsyncSession, username: str, password: str):
     """Authenticate user."""
-    user = get_user_by_username(db, username)
+    user = await get_user_by_username(db, username)
     if not user or not verify_password(password, user.hashed_password):
         return None
     return user
 
-def activate_user(db: Session, user: User):
+async def activate_user(db: AsyncSession, user: User):
     """Activate user account."""
     user.is_active = True
-    db.commit()
+    await db.commit()
     return user
 
-def deactivate_user(db: Session, user: User):
+async def deactivate_user(db: AsyncSession, user: User):
     """Deactivate user account."""
     user.is_active = False
-    db.commit()
+    await db.commit()
     return user
\ No newline at end of file
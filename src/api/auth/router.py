@@ -3,7 +3,7 @@ Authentication router for handling login and user management.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
 from src.api.auth.models import User, UserCreate, UserUpdate, Token
@@ -14,14 +14,14 @@ from src.api.auth.crud import (
     get_user_by_username,
     update_user
 )
-from src.api.database import get_db
+from src.api.database import get_async_db
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get current user from JWT token."""
     credentials_exception = HTTPException(
@@ -34,7 +34,7 @@ async def get_current_user(
     if token_data is None:
         raise credentials_exception
     
-    user = get_user_by_username(db, token_data.username)
+    user = await get_user_by_username(db, token_data.username)
     if user is None:
         raise credentials_exception
     
@@ -43,10 +43,10 @@ async def get_current_user(
 @router.post("/token", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login endpoint to get JWT token."""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -64,10 +64,10 @@ async def login(
 @router.post("/users", response_model=User)
 async def register_user(
     user: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create new user."""
-    return create_user(db, user)
+    return await create_user(db, user)
 
 @router.get("/users/me", response_model=User)
 async def read_current_user(
@@ -80,17 +80,17 @@ async def read_current_user(
 async def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user information."""
-    return update_user(db, current_user, user_update)
+    return await update_user(db, current_user, user_update)
 
 @router.post("/users/deactivate", response_model=User)
 async def deactivate_current_user(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Deactivate current user account."""
     current_user.is_active = False
-    db.commit()
+    await db.commit()
     return current_user
\ No newline at end of file
@@ -1,10 +1,36 @@
 """
 Redis cache configuration and utilities.
+
+The store behind the cache is chosen with the CACHE_TYPE environment
+variable: "redis" (default) or "memory" for tests and local benchmarks.
 """
-from typing import Any, Optional
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from enum import Enum
+from functools import wraps
+from typing import (
+    Any, Awaitable, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Union
+)
+import asyncio
+import hashlib
+import inspect
 import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+import uuid
 import redis
-from fastapi import HTTPException
+from fastapi import HTTPException, Request, Response
+
+from src.api.cache_backends import CacheBackend, MemoryBackend, RedisBackend, refill_token_bucket
+from src.api.database import LazySession
+from src.api.serialization import SerializationError, dumps, loads
+
+# Backend selection: "redis" or "memory"
+CACHE_BACKEND = os.getenv("CACHE_TYPE", "redis")
 
 # Redis configuration
 REDIS_HOST = "localhost"
@@ -12,103 +38,799 @@ REDIS_PORT = 6379
 REDIS_DB = 0
 REDIS_PREFIX = "mcp:"
 DEFAULT_EXPIRE = 3600  # 1 hour in seconds
+CACHE_KEY_VERSION = "v1"  # bump to invalidate every cache_response entry
+MAX_KEY_PARAMS_LENGTH = 128  # longer parameter strings are hashed
+TAG_PREFIX = REDIS_PREFIX + "tag:"
+TAG_INVALIDATION_BATCH_SIZE = 500  # tagged keys unlinked per round trip
+RATE_LIMIT_PREFIX = REDIS_PREFIX + "ratelimit:"
+
+# Stampede protection configuration
+RECOMPUTE_LOCK_TIMEOUT = 10  # seconds a worker may hold a recompute lock
+RECOMPUTE_POLL_INTERVAL = 0.05  # seconds between checks while another worker recomputes
+
+# Async connection pool configuration
+REDIS_MAX_CONNECTIONS = 50  # per worker
+REDIS_SOCKET_TIMEOUT = 2  # seconds per command
+REDIS_CONNECT_TIMEOUT = 2  # seconds
+REDIS_POOL_TIMEOUT = 5  # seconds to wait for a free connection
 
 # Rate limiting configuration
 RATE_LIMIT_WINDOW = 60  # 1 minute
 RATE_LIMIT_MAX_REQUESTS = 100  # requests per window
+RATE_LIMIT_LOCAL_MAX_KEYS = 10000  # buckets kept by the in-process fallback
 
-redis_client = redis.Redis(
-    host=REDIS_HOST,
-    port=REDIS_PORT,
-    db=REDIS_DB,
-    decode_responses=True
-)
+# Local (in-process) cache configuration
+LOCAL_CACHE_ENABLED = True
+LOCAL_CACHE_MAX_SIZE = 1024  # entries per worker
+LOCAL_CACHE_TTL = 30  # seconds; bounds staleness across workers
+INVALIDATION_CHANNEL = REDIS_PREFIX + "invalidate"
+
+logger = logging.getLogger(__name__)
+
+def create_backend(name: str = CACHE_BACKEND) -> CacheBackend:
+    """Create the cache backend named in configuration."""
+    if name == "redis":
+        return RedisBackend(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            connect_timeout=REDIS_CONNECT_TIMEOUT,
+            pool_timeout=REDIS_POOL_TIMEOUT
+        )
+    if name == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Unknown cache backend: {name}")
+
+backend = create_backend()
+
+def configure_cache(name: str) -> CacheBackend:
+    """Replace the cache backend, e.g. with "memory" in tests."""
+    global backend
+    backend = create_backend(name)
+    return backend
+
+class LocalCache:
+    """Bounded in-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_size: int = LOCAL_CACHE_MAX_SIZE, ttl: int = LOCAL_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get value if present and not expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        """Store value, evicting the least recently used entry when full."""
+        ttl = min(self.ttl, expire) if expire else self.ttl
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Drop a single key."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_pattern(self, pattern: str) -> None:
+        """Drop every key matching a glob-style pattern."""
+        with self._lock:
+            for key in [k for k in self._data if fnmatchcase(k, pattern)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+local_cache = LocalCache()
+
+# Hit/miss counters per cache tier
+cache_stats: Dict[str, int] = {
+    "local_hits": 0,
+    "local_misses": 0,
+    "redis_hits": 0,
+    "redis_misses": 0,
+}
+
+_invalidation_task: Optional[asyncio.Task] = None
+
+def get_cache_stats() -> Dict[str, int]:
+    """Return hit/miss counters for the local and Redis tiers."""
+    return {**cache_stats, "local_size": len(local_cache)}
+
+def reset_cache_stats() -> None:
+    """Reset hit/miss counters."""
+    for name in cache_stats:
+        cache_stats[name] = 0
+
+def publish_invalidation(kind: str, value: Any) -> None:
+    """Tell every worker to drop a key or pattern from its local cache."""
+    try:
+        backend.publish_sync(INVALIDATION_CHANNEL, json.dumps({kind: value}))
+    except redis.RedisError:
+        logger.warning("Could not publish cache invalidation for %s", value)
+
+async def apublish_invalidation(kind: str, value: Any) -> None:
+    """Async variant of publish_invalidation."""
+    try:
+        await backend.publish(INVALIDATION_CHANNEL, json.dumps({kind: value}))
+    except redis.RedisError:
+        logger.warning("Could not publish cache invalidation for %s", value)
+
+def _handle_invalidation(message: Union[bytes, str]) -> None:
+    """Apply an invalidation message received over pub/sub."""
+    try:
+        data = json.loads(message)
+    except (TypeError, ValueError):
+        return
+    if "key" in data:
+        local_cache.delete(data["key"])
+    elif "keys" in data:
+        for key in data["keys"]:
+            local_cache.delete(key)
+    elif "pattern" in data:
+        local_cache.delete_pattern(data["pattern"])
+
+async def _listen_for_invalidations() -> None:
+    """Apply invalidation messages until cancelled, resubscribing on errors."""
+    while True:
+        try:
+            async for message in backend.subscribe(INVALIDATION_CHANNEL):
+                _handle_invalidation(message)
+        except redis.RedisError:
+            # Messages may have been missed while disconnected
+            logger.warning("Cache invalidation listener disconnected, clearing local cache")
+            local_cache.clear()
+            await asyncio.sleep(1)
+
+def start_invalidation_listener() -> None:
+    """Subscribe to invalidation messages in a background task.
+
+    Call once per worker from the application startup event.
+    """
+    global _invalidation_task
+    if not LOCAL_CACHE_ENABLED or _invalidation_task is not None:
+        return
+    _invalidation_task = asyncio.get_running_loop().create_task(_listen_for_invalidations())
+
+async def close_cache() -> None:
+    """Stop the invalidation listener and release pooled connections.
+
+    Call from the application shutdown event.
+    """
+    global _invalidation_task
+    if _invalidation_task is not None:
+        _invalidation_task.cancel()
+        try:
+            await _invalidation_task
+        except asyncio.CancelledError:
+            pass
+        _invalidation_task = None
+    await backend.close()
 
 def get_cache_key(*args: Any) -> str:
     """Generate cache key from arguments."""
     return REDIS_PREFIX + ":".join(str(arg) for arg in args)
 
-async def get_cached_data(key: str) -> Optional[str]:
-    """Get data from cache."""
+_KEY_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+def _is_key_value(value: Any) -> bool:
+    """Whether a value can take part in a cache key.
+
+    Dependency-injected objects (sessions, ORM instances, requests, background
+    tasks) are not plain values and are skipped.
+    """
+    if isinstance(value, (_KEY_SCALAR_TYPES, Enum)):
+        return True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(isinstance(item, (_KEY_SCALAR_TYPES, Enum)) for item in value)
+    return False
+
+def _key_value(value: Any) -> str:
+    """Render a key value in a stable form."""
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, (set, frozenset)):
+        return ",".join(sorted(_key_value(item) for item in value))
+    if isinstance(value, (list, tuple)):
+        return ",".join(_key_value(item) for item in value)
+    return str(value)
+
+def _resolve_param(arguments: Dict[str, Any], path: str) -> Any:
+    """Resolve a dotted parameter path such as ``current_user.id``."""
+    name, *attrs = path.split(".")
+    value = arguments.get(name)
+    for attr in attrs:
+        value = getattr(value, attr, None)
+    return value
+
+def build_cache_key(
+    namespace: str,
+    params: Optional[Dict[str, Any]] = None,
+    version: str = CACHE_KEY_VERSION
+) -> str:
+    """Build a deterministic cache key.
+
+    Keys look like ``mcp:v1:get_dashboard:current_user.id=7``. Parameters are
+    sorted by name and hashed once they exceed MAX_KEY_PARAMS_LENGTH, so the
+    key length is bounded while the namespace stays readable for pattern
+    invalidation.
+    """
+    key = f"{REDIS_PREFIX}{version}:{namespace}"
+    if not params:
+        return key
+    raw = "&".join(f"{name}={_key_value(params[name])}" for name in sorted(params))
+    if len(raw) > MAX_KEY_PARAMS_LENGTH:
+        raw = hashlib.sha256(raw.encode()).hexdigest()
+    return f"{key}:{raw}"
+
+async def get_cached_data(key: str) -> Optional[Union[bytes, str]]:
+    """Get the raw cached payload, checking the local tier before Redis.
+
+    Decode it with src.api.serialization.loads().
+    """
+    if LOCAL_CACHE_ENABLED:
+        cached = local_cache.get(key)
+        if cached is not None:
+            cache_stats["local_hits"] += 1
+            return cached
+        cache_stats["local_misses"] += 1
+
     try:
-        return redis_client.get(key)
+        cached = await backend.get(key)
     except redis.RedisError:
         return None
 
-async def set_cached_data(key: str, data: Any, expire: int = DEFAULT_EXPIRE) -> bool:
-    """Set data in cache."""
+    if cached is None:
+        cache_stats["redis_misses"] += 1
+        return None
+
+    cache_stats["redis_hits"] += 1
+    if LOCAL_CACHE_ENABLED:
+        local_cache.set(key, cached)
+    return cached
+
+async def set_cached_data(
+    key: str,
+    data: Any,
+    expire: int = DEFAULT_EXPIRE,
+    tags: Optional[Sequence[str]] = None
+) -> bool:
+    """Set data in cache, recording the key under each tag."""
+    try:
+        value = dumps(data)
+    except SerializationError as e:
+        logger.warning("Not caching %s: %s", key, e)
+        return False
+    if LOCAL_CACHE_ENABLED:
+        local_cache.set(key, value, expire)
+    try:
+        stored = await backend.set(key, value, expire)
+        if tags:
+            # Keep each tag set alive at least as long as its newest member
+            await backend.add_to_sets([TAG_PREFIX + tag for tag in tags], key, expire)
+        return stored
+    except redis.RedisError:
+        return False
+
+async def get_many(keys: Sequence[str]) -> Dict[str, Any]:
+    """Get several cached values with a single MGET.
+
+    Returns decoded values for the keys that were found; missing and
+    unreadable entries are left out.
+    """
+    found: Dict[str, Any] = {}
+    remaining: List[str] = []
+    for key in dict.fromkeys(keys):
+        cached = local_cache.get(key) if LOCAL_CACHE_ENABLED else None
+        if cached is None:
+            remaining.append(key)
+            continue
+        cache_stats["local_hits"] += 1
+        try:
+            found[key] = loads(cached)
+        except SerializationError:
+            pass
+    if LOCAL_CACHE_ENABLED:
+        cache_stats["local_misses"] += len(remaining)
+    if not remaining:
+        return found
+
+    try:
+        values = await backend.mget(remaining)
+    except redis.RedisError:
+        return found
+
+    for key, cached in zip(remaining, values):
+        if cached is None:
+            cache_stats["redis_misses"] += 1
+            continue
+        cache_stats["redis_hits"] += 1
+        try:
+            found[key] = loads(cached)
+        except SerializationError:
+            continue
+        if LOCAL_CACHE_ENABLED:
+            local_cache.set(key, cached)
+    return found
+
+async def set_many(mapping: Mapping[str, Any], expire: int = DEFAULT_EXPIRE) -> bool:
+    """Set several cache entries in one pipelined round trip."""
+    if not mapping:
+        return True
+    payloads: Dict[str, bytes] = {}
+    for key, data in mapping.items():
+        try:
+            payloads[key] = dumps(data)
+        except SerializationError as e:
+            logger.warning("Not caching %s: %s", key, e)
+    if LOCAL_CACHE_ENABLED:
+        for key, value in payloads.items():
+            local_cache.set(key, value, expire)
     try:
-        return redis_client.setex(key, expire, json.dumps(data))
+        await backend.set_many(payloads, expire)
     except redis.RedisError:
         return False
+    return len(payloads) == len(mapping)
+
+async def get_many_or_load(
+    keys: Sequence[str],
+    loader: Callable[[List[str]], Any],
+    expire: int = DEFAULT_EXPIRE
+) -> Dict[str, Any]:
+    """Get several entries, loading only the missing ones in one batch.
+
+    ``loader`` receives the list of missing keys and returns (or resolves
+    to) a mapping of key to value; keys it leaves out are not cached.
+    """
+    found = await get_many(keys)
+    missing = [key for key in dict.fromkeys(keys) if key not in found]
+    if missing:
+        loaded = loader(missing)
+        if inspect.isawaitable(loaded):
+            loaded = await loaded
+        await set_many(loaded, expire)
+        found.update(loaded)
+    return found
 
 async def delete_cached_data(key: str) -> bool:
-    """Delete data from cache."""
+    """Delete data from cache on every worker."""
+    if LOCAL_CACHE_ENABLED:
+        local_cache.delete(key)
     try:
-        return bool(redis_client.delete(key))
+        deleted = bool(await backend.delete(key))
     except redis.RedisError:
         return False
+    if LOCAL_CACHE_ENABLED:
+        await apublish_invalidation("key", key)
+    return deleted
 
-async def check_rate_limit(key: str) -> bool:
-    """Check if rate limit is exceeded."""
-    try:
-        current = redis_client.get(key)
-        if current is None:
-            redis_client.setex(key, RATE_LIMIT_WINDOW, 1)
-            return True
-        
-        count = int(current)
-        if count >= RATE_LIMIT_MAX_REQUESTS:
-            return False
-        
-        redis_client.incr(key)
-        return True
+class RateLimitResult(NamedTuple):
+    """Outcome of consuming one request from a token bucket."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # seconds until the bucket is full again
+    retry_after: float  # seconds until the next request is allowed
+
+    @classmethod
+    def from_tokens(cls, allowed: bool, tokens: float, limit: int, rate: float) -> "RateLimitResult":
+        """Build a result from the tokens left in a bucket."""
+        return cls(
+            allowed=allowed,
+            limit=limit,
+            remaining=int(tokens),
+            reset_after=(limit - tokens) / rate,
+            retry_after=0.0 if allowed else (1 - tokens) / rate
+        )
+
+    def headers(self) -> Dict[str, str]:
+        """Rate limit headers describing the remaining quota."""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after))
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+class LocalRateLimiter:
+    """In-process token buckets, used while Redis is unreachable.
+
+    Limits are enforced per worker rather than globally.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_LOCAL_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Consume one token from the bucket for key."""
+        rate = limit / window
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (limit, now))
+            allowed, tokens = refill_token_bucket(tokens, last, now, limit, rate)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return RateLimitResult.from_tokens(allowed, tokens, limit, rate)
+
+local_rate_limiter = LocalRateLimiter()
+
+async def consume_rate_limit(
+    key: str,
+    limit: int = RATE_LIMIT_MAX_REQUESTS,
+    window: int = RATE_LIMIT_WINDOW
+) -> RateLimitResult:
+    """Consume one request from the token bucket for key.
+
+    Allows bursts of up to ``limit`` requests, refilled at ``limit`` per
+    ``window`` seconds. The bucket is updated atomically in the backend (a
+    Lua script on Redis). Falls back to an in-process limiter when Redis is
+    unreachable.
+    """
+    try:
+        allowed, tokens = await backend.consume_token(RATE_LIMIT_PREFIX + key, limit, window)
     except redis.RedisError:
-        # If Redis is down, allow the request
-        return True
+        return local_rate_limiter.consume(key, limit, window)
+    return RateLimitResult.from_tokens(allowed, tokens, limit, limit / window)
+
+async def check_rate_limit(
+    key: str,
+    limit: int = RATE_LIMIT_MAX_REQUESTS,
+    window: int = RATE_LIMIT_WINDOW
+) -> bool:
+    """Check if rate limit is exceeded, consuming one request if not."""
+    result = await consume_rate_limit(key, limit, window)
+    return result.allowed
 
 def clear_cache_pattern(pattern: str) -> bool:
-    """Clear all cache keys matching pattern."""
+    """Clear all cache keys matching pattern (synchronous, for CLI and scripts).
+
+    Keys are found with incremental SCAN and removed with pipelined UNLINK
+    batches, so Redis is never blocked for the whole keyspace.
+    """
+    if LOCAL_CACHE_ENABLED:
+        local_cache.delete_pattern(REDIS_PREFIX + pattern)
     try:
-        keys = redis_client.keys(REDIS_PREFIX + pattern)
-        if keys:
-            return bool(redis_client.delete(*keys))
+        backend.delete_pattern_sync(REDIS_PREFIX + pattern)
+    except redis.RedisError:
+        return False
+    if LOCAL_CACHE_ENABLED:
+        publish_invalidation("pattern", REDIS_PREFIX + pattern)
+    return True
+
+async def aclear_cache_pattern(pattern: str) -> bool:
+    """Async variant of clear_cache_pattern."""
+    if LOCAL_CACHE_ENABLED:
+        local_cache.delete_pattern(REDIS_PREFIX + pattern)
+    try:
+        await backend.delete_pattern(REDIS_PREFIX + pattern)
+    except redis.RedisError:
+        return False
+    if LOCAL_CACHE_ENABLED:
+        await apublish_invalidation("pattern", REDIS_PREFIX + pattern)
+    return True
+
+# Cache tags
+async def invalidate_tags(*tags: str) -> int:
+    """Delete every cache entry recorded under any of the given tags.
+
+    Costs O(tagged keys) and never scans the keyspace. Returns the number
+    of cache keys unlinked.
+    """
+    unlinked = 0
+    try:
+        for tag in tags:
+            tag_key = TAG_PREFIX + tag
+            batch: List[str] = []
+            async for key in backend.iter_set(tag_key):
+                batch.append(key)
+                if len(batch) >= TAG_INVALIDATION_BATCH_SIZE:
+                    unlinked += await _unlink_tagged(batch)
+                    batch = []
+            if batch:
+                unlinked += await _unlink_tagged(batch)
+            await backend.delete(tag_key)
+    except redis.RedisError:
+        logger.warning("Could not invalidate cache tags %s", tags)
+    return unlinked
+
+async def _unlink_tagged(keys: List[str]) -> int:
+    """Unlink tagged keys here and drop them from every local cache."""
+    if LOCAL_CACHE_ENABLED:
+        for key in keys:
+            local_cache.delete(key)
+    unlinked = await backend.delete(*keys)
+    if LOCAL_CACHE_ENABLED:
+        await apublish_invalidation("keys", keys)
+    return unlinked
+
+# Stampede protection
+# Recomputations in flight in this worker, by cache key
+_inflight: Dict[str, asyncio.Task] = {}
+
+async def _acquire_lock(lock_key: str, token: str, timeout: int) -> bool:
+    """Try to take the cross-worker recompute lock for a key."""
+    try:
+        return await backend.set_if_absent(lock_key, token, timeout)
+    except redis.RedisError:
+        # Without Redis there is nothing to coordinate with
         return True
+
+async def _release_lock(lock_key: str, token: str) -> None:
+    """Release the recompute lock if this worker still owns it."""
+    try:
+        await backend.delete_if_equals(lock_key, token)
     except redis.RedisError:
+        pass
+
+async def _wait_for_fresh_entry(key: str, timeout: float) -> Optional[Dict[str, Any]]:
+    """Wait for another worker to store a fresh entry for key.
+
+    Polls Redis directly: the local tier may still hold the expired entry,
+    which would hide the one the other worker writes.
+    """
+    local_cache.delete(key)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(RECOMPUTE_POLL_INTERVAL)
+        try:
+            cached = await backend.get(key)
+        except redis.RedisError:
+            cached = None
+        entry = _load_entry(cached)
+        if entry is not None and entry["fresh_until"] > time.time():
+            if LOCAL_CACHE_ENABLED:
+                local_cache.set(key, cached, max(1, int(entry["fresh_until"] - time.time())))
+            return entry
+    return None
+
+def _load_entry(cached: Optional[Union[bytes, str]]) -> Optional[Dict[str, Any]]:
+    """Decode a cache_response entry, treating unreadable payloads as misses."""
+    if cached is None:
+        return None
+    try:
+        return loads(cached)
+    except (SerializationError, ValueError):
+        logger.warning("Discarding unreadable cache entry")
+        return None
+
+def _single_flight(key: str, compute: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+    """Run compute once per key in this worker, sharing the task with concurrent callers."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.get_running_loop().create_task(compute())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return task
+
+async def _call_detached(func: Callable[..., Awaitable[Any]], args: Sequence[Any], kwargs: Dict[str, Any]) -> Any:
+    """Call an endpoint outside the request its arguments came from.
+
+    By the time a background refresh runs, the request's database sessions
+    are closed and its response is sent. Sessions are replaced with new ones
+    of the same kind, closed afterwards, and responses with throwaway ones.
+    """
+    sessions: List[LazySession] = []
+
+    def detach(value: Any) -> Any:
+        if isinstance(value, LazySession):
+            sessions.append(value.fork())
+            return sessions[-1]
+        if isinstance(value, Response):
+            return Response()
+        return value
+
+    try:
+        return await func(*map(detach, args), **{name: detach(value) for name, value in kwargs.items()})
+    finally:
+        for session in sessions:
+            if session.session_started:
+                await session.close()
+
+def _log_refresh_error(task: asyncio.Task) -> None:
+    """Log failures of background refreshes."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background cache refresh failed", exc_info=task.exception())
+
+def _expires_early(entry: Dict[str, Any], now: float, beta: float) -> bool:
+    """Probabilistic early expiration (XFetch).
+
+    Entries that were slow to compute are refreshed earlier, and the chance
+    of a refresh grows as expiry approaches, spreading recomputations out.
+    """
+    if beta <= 0:
         return False
+    return now - entry["delta"] * beta * math.log(1.0 - random.random()) >= entry["fresh_until"]
 
 # Cache decorators
-def cache_response(expire: int = DEFAULT_EXPIRE):
-    """Decorator to cache endpoint responses."""
+def cache_response(
+    expire: int = DEFAULT_EXPIRE,
+    key_params: Optional[Sequence[str]] = None,
+    namespace: Optional[str] = None,
+    version: str = CACHE_KEY_VERSION,
+    stale_ttl: int = 0,
+    early_expiration_beta: float = 0.0,
+    lock_timeout: int = RECOMPUTE_LOCK_TIMEOUT,
+    tags: Optional[Sequence[str]] = None
+):
+    """Decorator to cache endpoint responses.
+
+    ``key_params`` lists the arguments (dotted paths allowed, e.g.
+    ``current_user.id``) that identify a response. When omitted, every
+    argument holding a plain value is used and dependency-injected objects
+    are skipped.
+
+    On a miss only one request per key recomputes the response: concurrent
+    requests in the same worker share the computation and other workers wait
+    on a Redis lock. With ``stale_ttl`` an expired response keeps being
+    served for that many seconds while a background task refreshes it, using
+    the arguments of the request that noticed the expiry with new database
+    sessions (see _call_detached).
+    ``early_expiration_beta`` > 0 enables probabilistic early refresh.
+
+    ``tags`` are format strings over the arguments, e.g.
+    ``["deals", "user:{current_user.id}"]``; entries can then be dropped
+    with invalidate_tags(). CRUDBase writes invalidate the tag named after
+    their table.
+    """
     def decorator(func):
+        signature = inspect.signature(func)
+        key_namespace = namespace or func.__name__
+
+        @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            cache_key = get_cache_key(func.__name__, *args, *kwargs.values())
-            
+            bound = signature.bind_partial(*args, **kwargs)
+            if key_params is not None:
+                params = {path: _resolve_param(bound.arguments, path) for path in key_params}
+            else:
+                params = {
+                    name: value for name, value in bound.arguments.items()
+                    if _is_key_value(value)
+                }
+            cache_key = build_cache_key(key_namespace, params, version)
+            entry_tags = [tag.format(**bound.arguments) for tag in tags or ()]
+
+            async def recompute(background: bool = False) -> Any:
+                lock_key = cache_key + ":lock"
+                token = uuid.uuid4().hex
+                locked = await _acquire_lock(lock_key, token, lock_timeout)
+                if not locked:
+                    if background:
+                        return None
+                    # Another worker is recomputing; use its result
+                    entry = await _wait_for_fresh_entry(cache_key, lock_timeout)
+                    if entry is not None:
+                        return entry["value"]
+                try:
+                    started = time.time()
+                    if background:
+                        # The request that supplied the arguments has finished
+                        result = await _call_detached(func, args, kwargs)
+                    else:
+                        result = await func(*args, **kwargs)
+                    finished = time.time()
+                    entry = {
+                        "value": result,
+                        "fresh_until": finished + expire,
+                        "delta": finished - started
+                    }
+                    await set_cached_data(cache_key, entry, expire + stale_ttl, entry_tags)
+                    return result
+                finally:
+                    if locked:
+                        await _release_lock(lock_key, token)
+
             # Try to get from cache
-            cached = await get_cached_data(cache_key)
-            if cached:
-                return json.loads(cached)
-            
-            # Get fresh data
-            result = await func(*args, **kwargs)
-            
-            # Cache the result
-            await set_cached_data(cache_key, result, expire)
-            
-            return result
+            entry = _load_entry(await get_cached_data(cache_key))
+            if entry is not None:
+                now = time.time()
+                if now < entry["fresh_until"] and not _expires_early(entry, now, early_expiration_beta):
+                    return entry["value"]
+                if now >= entry["fresh_until"]:
+                    # Keep expired entries out of the local tier, so the
+                    # refreshed one is read from Redis once it is written
+                    local_cache.delete(cache_key)
+                if now < entry["fresh_until"] + stale_ttl:
+                    # Serve the current value while one task refreshes it
+                    if cache_key not in _inflight:
+                        task = _single_flight(cache_key, lambda: recompute(background=True))
+                        task.add_done_callback(_log_refresh_error)
+                    return entry["value"]
+
+            # Get fresh data, once per key. Shield so one cancelled request
+            # does not cancel the computation shared with the others.
+            return await asyncio.shield(_single_flight(cache_key, recompute))
         return wrapper
     return decorator
 
-def rate_limit(limit_key: str):
-    """Decorator to apply rate limiting."""
+_RATE_LIMIT_REQUEST_PARAM = "rate_limit_request"
+_RATE_LIMIT_RESPONSE_PARAM = "rate_limit_response"
+
+def _rate_limit_principal(per: str, request: Optional[Request], arguments: Dict[str, Any]) -> str:
+    """Identify who a request is counted against."""
+    if per == "global":
+        return "global"
+    if per == "user":
+        user_id = getattr(arguments.get("current_user"), "id", None)
+        if user_id is not None:
+            return f"user:{user_id}"
+    elif per == "api_key":
+        api_key = request.headers.get("X-API-Key") if request is not None else None
+        if api_key:
+            return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:32]
+    host = request.client.host if request is not None and request.client else "unknown"
+    return f"ip:{host}"
+
+def _with_rate_limit_params(signature: inspect.Signature) -> inspect.Signature:
+    """Add the Request/Response parameters FastAPI should inject."""
+    params = list(signature.parameters.values())
+    extra = [
+        inspect.Parameter(_RATE_LIMIT_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        inspect.Parameter(_RATE_LIMIT_RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response)
+    ]
+    if params and params[-1].kind == inspect.Parameter.VAR_KEYWORD:
+        return signature.replace(parameters=params[:-1] + extra + params[-1:])
+    return signature.replace(parameters=params + extra)
+
+def rate_limit(
+    limit_key: str,
+    limit: int = RATE_LIMIT_MAX_REQUESTS,
+    window: int = RATE_LIMIT_WINDOW,
+    per: str = "user"
+):
+    """Decorator to apply rate limiting.
+
+    Each principal gets its own bucket of ``limit`` requests per ``window``
+    seconds. ``per`` is one of ``"user"`` (the ``current_user`` argument),
+    ``"api_key"`` (the X-API-Key header), ``"ip"`` or ``"global"``; user and
+    API key limits fall back to the client IP when unavailable. Remaining
+    quota is reported in X-RateLimit-* headers.
+    """
     def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
         async def wrapper(*args, **kwargs):
-            if not await check_rate_limit(limit_key):
+            request = kwargs.pop(_RATE_LIMIT_REQUEST_PARAM, None)
+            response = kwargs.pop(_RATE_LIMIT_RESPONSE_PARAM, None)
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            principal = _rate_limit_principal(per, request, arguments)
+
+            result = await consume_rate_limit(f"{limit_key}:{principal}", limit, window)
+            if not result.allowed:
                 raise HTTPException(
                     status_code=429,
-                    detail="Too many requests"
+                    detail="Too many requests",
+                    headers=result.headers()
                 )
+            if response is not None:
+                response.headers.update(result.headers())
             return await func(*args, **kwargs)
+
+        wrapper.__signature__ = _with_rate_limit_params(signature)
         return wrapper
     return decorator
\ No newline at end of file
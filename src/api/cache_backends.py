@@ -0,0 +1,490 @@
+"""
+Storage backends for the cache layer.
+
+RedisBackend is used in production. MemoryBackend keeps everything in
+process with the same TTL, INCR, pub/sub and SCAN semantics, for tests and
+local benchmarks without services. Backends signal failures with
+redis.RedisError so callers handle both the same way.
+"""
+from abc import ABC, abstractmethod
+from fnmatch import fnmatchcase
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import asyncio
+import threading
+import time
+import redis
+import redis.asyncio
+
+# Keys requested per SCAN/SSCAN call and removed per UNLINK
+SCAN_BATCH_SIZE = 500
+# UNLINK batches sent per pipeline round trip
+UNLINK_PIPELINE_DEPTH = 10
+
+def refill_token_bucket(
+    tokens: float,
+    last: float,
+    now: float,
+    limit: int,
+    rate: float
+) -> Tuple[bool, float]:
+    """Refill a token bucket and try to take one token.
+
+    Returns whether a token was taken and the tokens left.
+    """
+    tokens = min(limit, tokens + max(0.0, now - last) * rate)
+    if tokens >= 1:
+        return True, tokens - 1
+    return False, tokens
+
+class CacheBackend(ABC):
+    """Operations the cache layer needs from its store.
+
+    Async methods serve request handlers; the ``*_sync`` methods are for CLI
+    and script use.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a value."""
+        pass
+
+    @abstractmethod
+    async def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """Get several values in one round trip."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, expire: int) -> bool:
+        """Set a value with a TTL in seconds."""
+        pass
+
+    @abstractmethod
+    async def set_many(self, mapping: Dict[str, bytes], expire: int) -> None:
+        """Set several values with the same TTL in one round trip."""
+        pass
+
+    @abstractmethod
+    async def set_if_absent(self, key: str, value: str, expire: int) -> bool:
+        """Set a value only if the key does not exist (SET NX EX)."""
+        pass
+
+    @abstractmethod
+    async def delete_if_equals(self, key: str, value: str) -> bool:
+        """Delete a key only if it holds value, atomically."""
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> int:
+        """Delete keys, reclaiming memory in the background where supported."""
+        pass
+
+    @abstractmethod
+    async def incr(self, key: str, expire: Optional[int] = None) -> int:
+        """Increment a counter, setting its TTL when it is created."""
+        pass
+
+    @abstractmethod
+    async def consume_token(self, key: str, limit: int, window: int) -> Tuple[bool, float]:
+        """Atomically take one token from a bucket of ``limit`` per ``window`` seconds."""
+        pass
+
+    @abstractmethod
+    async def add_to_sets(self, set_keys: Sequence[str], member: str, expire: int) -> None:
+        """Add member to each set, keeping each set alive for at least expire seconds."""
+        pass
+
+    @abstractmethod
+    def iter_set(self, set_key: str) -> AsyncIterator[str]:
+        """Iterate set members incrementally (SSCAN)."""
+        pass
+
+    @abstractmethod
+    def scan(self, match: str) -> AsyncIterator[str]:
+        """Iterate keys matching a glob pattern incrementally (SCAN)."""
+        pass
+
+    @abstractmethod
+    async def delete_pattern(self, match: str) -> None:
+        """Delete every key matching a glob pattern without blocking the store."""
+        pass
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        """Publish a message to a channel."""
+        pass
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> AsyncIterator[Union[bytes, str]]:
+        """Yield messages published to a channel until closed."""
+        pass
+
+    @abstractmethod
+    def delete_pattern_sync(self, match: str) -> None:
+        """Blocking variant of delete_pattern."""
+        pass
+
+    @abstractmethod
+    def publish_sync(self, channel: str, message: str) -> None:
+        """Blocking variant of publish."""
+        pass
+
+    async def close(self) -> None:
+        """Release connections."""
+
+class ConnectOutsideLockPool(redis.asyncio.BlockingConnectionPool):
+    """BlockingConnectionPool that connects after leaving its lock.
+
+    redis-py 5.0.1 connects while holding the pool's condition, and a failed
+    connect releases the connection by taking the condition again, so with
+    Redis down every call hangs for the whole pool timeout. Here only taking
+    a slot waits (up to ``timeout``); an unreachable server fails within the
+    connect timeout.
+    """
+
+    async def get_connection(self, command_name, *keys, **options):
+        try:
+            connection = await asyncio.wait_for(self._take_connection(), self.timeout)
+        except asyncio.TimeoutError as e:
+            raise redis.ConnectionError("No connection available.") from e
+        try:
+            await self.ensure_connection(connection)
+        except BaseException:
+            await self.release(connection)
+            raise
+        return connection
+
+    async def _take_connection(self):
+        async with self._condition:
+            await self._condition.wait_for(self.can_get_connection)
+            try:
+                connection = self._available_connections.pop()
+            except IndexError:
+                connection = self.make_connection()
+            self._in_use_connections.add(connection)
+            return connection
+
+class RedisBackend(CacheBackend):
+    """Backend storing everything in Redis."""
+
+    # Compare-and-delete, so a lock is only released by its owner
+    RELEASE_SCRIPT = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return redis.call("del", KEYS[1])
+    end
+    return 0
+    """
+
+    # Token bucket refilled continuously at ARGV[2] tokens per second.
+    # Uses the server clock so workers agree.
+    TOKEN_BUCKET_SCRIPT = """
+    local limit = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local time = redis.call("TIME")
+    local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+    local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+    local tokens = tonumber(bucket[1]) or limit
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(limit, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+    redis.call("EXPIRE", KEYS[1], ARGV[3])
+    return {allowed, tostring(tokens)}
+    """
+
+    # Adds ARGV[2] to each set, never shortening a set's TTL
+    ADD_TO_SETS_SCRIPT = """
+    local ttl = tonumber(ARGV[1])
+    for _, set_key in ipairs(KEYS) do
+        redis.call("SADD", set_key, ARGV[2])
+        if redis.call("TTL", set_key) < ttl then
+            redis.call("EXPIRE", set_key, ttl)
+        end
+    end
+    return #KEYS
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        max_connections: int = 50,
+        socket_timeout: float = 2,
+        connect_timeout: float = 2,
+        pool_timeout: float = 5
+    ):
+        # Synchronous client, for CLI and script use only
+        self.sync_client = redis.Redis(host=host, port=port, db=db, decode_responses=True)
+        # Non-blocking client used by request handlers. Responses are left
+        # as bytes since cached payloads are binary. When every connection is
+        # busy, callers wait up to pool_timeout for one instead of failing.
+        self.pool = ConnectOutsideLockPool(
+            host=host,
+            port=port,
+            db=db,
+            max_connections=max_connections,
+            timeout=pool_timeout,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=connect_timeout
+        )
+        self.client = redis.asyncio.Redis(connection_pool=self.pool)
+        self._release = self.client.register_script(self.RELEASE_SCRIPT)
+        self._token_bucket = self.client.register_script(self.TOKEN_BUCKET_SCRIPT)
+        self._add_to_sets = self.client.register_script(self.ADD_TO_SETS_SCRIPT)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return await self.client.mget(keys)
+
+    async def set(self, key: str, value: bytes, expire: int) -> bool:
+        return bool(await self.client.setex(key, expire, value))
+
+    async def set_many(self, mapping: Dict[str, bytes], expire: int) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.setex(key, expire, value)
+        await pipe.execute()
+
+    async def set_if_absent(self, key: str, value: str, expire: int) -> bool:
+        return bool(await self.client.set(key, value, nx=True, ex=expire))
+
+    async def delete_if_equals(self, key: str, value: str) -> bool:
+        return bool(await self._release(keys=[key], args=[value]))
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        return await self.client.unlink(*keys)
+
+    async def incr(self, key: str, expire: Optional[int] = None) -> int:
+        value = await self.client.incr(key)
+        if value == 1 and expire is not None:
+            await self.client.expire(key, expire)
+        return value
+
+    async def consume_token(self, key: str, limit: int, window: int) -> Tuple[bool, float]:
+        allowed, tokens = await self._token_bucket(keys=[key], args=[limit, limit / window, window])
+        return bool(allowed), float(tokens)
+
+    async def add_to_sets(self, set_keys: Sequence[str], member: str, expire: int) -> None:
+        if set_keys:
+            await self._add_to_sets(keys=list(set_keys), args=[expire, member])
+
+    async def iter_set(self, set_key: str) -> AsyncIterator[str]:
+        async for member in self.client.sscan_iter(set_key, count=SCAN_BATCH_SIZE):
+            yield member.decode()
+
+    async def scan(self, match: str) -> AsyncIterator[str]:
+        async for key in self.client.scan_iter(match=match, count=SCAN_BATCH_SIZE):
+            yield key.decode()
+
+    async def delete_pattern(self, match: str) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        batch: List[str] = []
+        async for key in self.scan(match):
+            batch.append(key)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                pipe.unlink(*batch)
+                batch = []
+                if len(pipe) >= UNLINK_PIPELINE_DEPTH:
+                    await pipe.execute()
+        if batch:
+            pipe.unlink(*batch)
+        await pipe.execute()
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self.client.publish(channel, message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[Union[bytes, str]]:
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            async for message in pubsub.listen():
+                yield message["data"]
+        finally:
+            await pubsub.aclose()
+
+    def delete_pattern_sync(self, match: str) -> None:
+        pipe = self.sync_client.pipeline(transaction=False)
+        batch: List[str] = []
+        for key in self.sync_client.scan_iter(match=match, count=SCAN_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                pipe.unlink(*batch)
+                batch = []
+                if len(pipe) >= UNLINK_PIPELINE_DEPTH:
+                    pipe.execute()
+        if batch:
+            pipe.unlink(*batch)
+        pipe.execute()
+
+    def publish_sync(self, channel: str, message: str) -> None:
+        self.sync_client.publish(channel, message)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+        self.sync_client.close()
+
+class MemoryBackend(CacheBackend):
+    """In-process stand-in for Redis.
+
+    Supports TTLs, counters, sets, token buckets, glob SCAN and pub/sub
+    within one process. Thread-safe, so the sync methods can be used from
+    scripts while the event loop runs.
+    """
+
+    def __init__(self):
+        # key -> (value, expires_at or None); values are bytes, str, int,
+        # set or a (tokens, last refill) tuple
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def _get(self, key: str):
+        """Get a live value, dropping it if expired. Caller holds the lock."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def _ttl(self, key: str) -> Optional[float]:
+        """Seconds left for a live key, None when it never expires. Caller holds the lock."""
+        expires_at = self._data[key][1]
+        return None if expires_at is None else expires_at - time.monotonic()
+
+    def _put(self, key: str, value, expire: Optional[float]) -> None:
+        self._data[key] = (value, None if expire is None else time.monotonic() + expire)
+
+    def _keys_matching(self, match: str) -> List[str]:
+        with self._lock:
+            return [key for key in list(self._data) if self._get(key) is not None and fnmatchcase(key, match)]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._get(key)
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, expire: int) -> bool:
+        with self._lock:
+            self._put(key, value, expire)
+        return True
+
+    async def set_many(self, mapping: Dict[str, bytes], expire: int) -> None:
+        with self._lock:
+            for key, value in mapping.items():
+                self._put(key, value, expire)
+
+    async def set_if_absent(self, key: str, value: str, expire: int) -> bool:
+        with self._lock:
+            if self._get(key) is not None:
+                return False
+            self._put(key, value, expire)
+            return True
+
+    async def delete_if_equals(self, key: str, value: str) -> bool:
+        with self._lock:
+            if self._get(key) != value:
+                return False
+            del self._data[key]
+            return True
+
+    async def delete(self, *keys: str) -> int:
+        with self._lock:
+            deleted = 0
+            for key in keys:
+                if self._get(key) is not None:
+                    del self._data[key]
+                    deleted += 1
+            return deleted
+
+    async def incr(self, key: str, expire: Optional[int] = None) -> int:
+        with self._lock:
+            current = self._get(key)
+            if current is None:
+                self._put(key, 1, expire)
+                return 1
+            value = int(current) + 1
+            self._data[key] = (value, self._data[key][1])
+            return value
+
+    async def consume_token(self, key: str, limit: int, window: int) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._get(key) or (limit, now)
+            allowed, tokens = refill_token_bucket(tokens, last, now, limit, limit / window)
+            self._put(key, (tokens, now), window)
+        return allowed, tokens
+
+    async def add_to_sets(self, set_keys: Sequence[str], member: str, expire: int) -> None:
+        with self._lock:
+            for set_key in set_keys:
+                members = self._get(set_key)
+                if members is None:
+                    self._put(set_key, {member}, expire)
+                    continue
+                members.add(member)
+                ttl = self._ttl(set_key)
+                if ttl is not None and ttl < expire:
+                    self._put(set_key, members, expire)
+
+    async def iter_set(self, set_key: str) -> AsyncIterator[str]:
+        with self._lock:
+            members = list(self._get(set_key) or ())
+        for start in range(0, len(members), SCAN_BATCH_SIZE):
+            for member in members[start:start + SCAN_BATCH_SIZE]:
+                yield member
+            await asyncio.sleep(0)
+
+    async def scan(self, match: str) -> AsyncIterator[str]:
+        keys = self._keys_matching(match)
+        for start in range(0, len(keys), SCAN_BATCH_SIZE):
+            for key in keys[start:start + SCAN_BATCH_SIZE]:
+                yield key
+            await asyncio.sleep(0)
+
+    async def delete_pattern(self, match: str) -> None:
+        self.delete_pattern_sync(match)
+
+    async def publish(self, channel: str, message: str) -> None:
+        self.publish_sync(channel, message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[Union[bytes, str]]:
+        queue: asyncio.Queue = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(subscriber)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            with self._lock:
+                self._subscribers[channel].remove(subscriber)
+
+    def delete_pattern_sync(self, match: str) -> None:
+        keys = self._keys_matching(match)
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def publish_sync(self, channel: str, message: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    def keys(self) -> Iterator[str]:
+        """Live keys, for tests and debugging."""
+        return iter(self._keys_matching("*"))
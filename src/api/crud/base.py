@@ -1,63 +1,341 @@
 """
 Base CRUD operations.
 """
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from datetime import date, datetime
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Generic, List, Mapping, NamedTuple, Optional, Sequence,
+    Tuple, Type, TypeVar, Union
+)
 from fastapi import HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import Column, Date, DateTime, Select, func, insert, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, make_transient_to_detached, selectinload
+from sqlalchemy.exc import DBAPIError, IntegrityError
 
+from src.api.cache import (
+    apublish_invalidation,
+    delete_cached_data,
+    get_cached_data,
+    invalidate_tags,
+    set_cached_data,
+    set_many
+)
 from src.api.database import Base
+from src.api.fieldsets import InvalidFields, select_fields
+from src.api.pagination import DEFAULT_PAGE_SIZE, InvalidCursor, Page, paginate
+from src.api.serialization import SerializationError, loads
+
+# Entity cache configuration
+ENTITY_CACHE_PREFIX = "mcp:entity:"
+ENTITY_CACHE_TTL = 300  # default TTL for models that opt in
+ENTITY_NEGATIVE_CACHE_TTL = 30  # seconds a missing id is remembered
+
+# Bulk writes
+BULK_BATCH_SIZE = 1000  # rows per statement in create_many/update_many/upsert_many
+
+# Streaming reads
+STREAM_BATCH_SIZE = 1000  # rows fetched per round trip by stream_rows
+
+# INSERT ... ON CONFLICT constructs, by dialect
+UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+# Relationship paths to eager-load, e.g. ["deals", "deals.proposals"], or a load profile name
+LoadOption = Optional[Union[str, Sequence[str]]]
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+class BulkResult(NamedTuple):
+    """Rows written by a bulk operation and the input items that failed.
+
+    Rows are not guaranteed to follow input order. Each error is
+    ``{"index": position in the input, "error": message}``.
+    """
+    items: List[Any]
+    errors: List[Dict[str, Any]]
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base class for CRUD operations."""
-    
-    def __init__(self, model: Type[ModelType]):
+
+    def __init__(
+        self,
+        model: Type[ModelType],
+        cache_ttl: Optional[int] = None,
+        negative_cache_ttl: int = ENTITY_NEGATIVE_CACHE_TTL,
+        load_profiles: Optional[Dict[str, Sequence[str]]] = None
+    ):
         self.model = model
+        # Rows are cached by primary key only when a TTL is given
+        self.cache_ttl = cache_ttl
+        self.negative_cache_ttl = negative_cache_ttl
+        # Named sets of relationship paths that read methods accept as load=
+        self.load_profiles = load_profiles or {}
+
+    async def get(self, db: AsyncSession, id: Any, *, load: LoadOption = None) -> Optional[ModelType]:
+        """Get item by ID, from the entity cache when enabled.
+
+        Items with relationships to ``load`` bypass the cache, which only
+        holds column values.
+        """
+        if load:
+            return await db.get(self.model, id, options=self._load_options(load), populate_existing=True)
+        if not self.cache_ttl:
+            return await db.get(self.model, id)
+
+        key = self._cache_key(id)
+        cached = await get_cached_data(key)
+        if cached is not None:
+            try:
+                row = loads(cached)
+            except SerializationError:
+                pass
+            else:
+                # None records an id known to be missing
+                return None if row is None else await self._from_cache(db, row)
+
+        obj = await db.get(self.model, id)
+        if obj is None:
+            await set_cached_data(key, None, self.negative_cache_ttl)
+        else:
+            await set_cached_data(key, self._to_cache(obj), self.cache_ttl)
+        return obj
+
+    async def cache_entity(self, obj: ModelType) -> None:
+        """Write the current row to the entity cache on every worker."""
+        if self.cache_ttl:
+            await self._write_through(self._cache_key(obj.id), self._to_cache(obj), self.cache_ttl)
+
+    async def cache_missing(self, id: Any) -> None:
+        """Record a deleted row, so a lagging read replica cannot re-cache it."""
+        if self.cache_ttl:
+            await self._write_through(self._cache_key(id), None, self.negative_cache_ttl)
+
+    async def cache_entities(self, objs: Sequence[ModelType]) -> None:
+        """Write several rows to the entity cache in one round trip."""
+        if self.cache_ttl and objs:
+            rows = {self._cache_key(obj.id): self._to_cache(obj) for obj in objs}
+            await set_many(rows, self.cache_ttl)
+            await apublish_invalidation("keys", list(rows))
+
+    async def invalidate_entity(self, id: Any) -> None:
+        """Drop a row from the entity cache."""
+        if self.cache_ttl:
+            await delete_cached_data(self._cache_key(id))
+
+    async def invalidate_cached_responses(self) -> None:
+        """Drop cached responses tagged with this model's table, after a write."""
+        await invalidate_tags(self.model.__tablename__)
 
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        """Get item by ID."""
-        return db.query(self.model).filter(self.model.id == id).first()
+    def _cache_key(self, id: Any) -> str:
+        return f"{ENTITY_CACHE_PREFIX}{self.model.__tablename__}:{id}"
 
-    def get_multi(
+    async def _write_through(self, key: str, value: Any, expire: int) -> None:
+        await set_cached_data(key, value, expire)
+        # Other workers may still hold the previous row in their local tier
+        await apublish_invalidation("key", key)
+
+    def _to_cache(self, obj: ModelType) -> Dict[str, Any]:
+        """Column values of a row."""
+        return {attr.key: getattr(obj, attr.key) for attr in self._stored_attrs()}
+
+    def _stored_attrs(self) -> List[Any]:
+        # Generated columns are derived from the others and not worth caching
+        return [attr for attr in inspect(self.model).column_attrs if attr.columns[0].computed is None]
+
+    async def _from_cache(self, db: AsyncSession, row: Dict[str, Any]) -> ModelType:
+        """Rebuild a cached row and attach it to the session without a query."""
+        for attr in self._stored_attrs():
+            value = row.get(attr.key)
+            if isinstance(value, str):
+                column_type = attr.columns[0].type
+                if isinstance(column_type, DateTime):
+                    row[attr.key] = datetime.fromisoformat(value)
+                elif isinstance(column_type, Date):
+                    row[attr.key] = date.fromisoformat(value)
+        obj = self.model(**row)
+        make_transient_to_detached(obj)
+        return await db.merge(obj, load=False)
+
+    async def get_multi(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         skip: int = 0,
         limit: int = 100,
+        filters: Dict = None,
+        load: LoadOption = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Any]:
+        """Get multiple items with optional filtering.
+
+        With ``fields``, only those columns (and the id) are selected and
+        items are column dicts rather than models.
+        """
+        if fields:
+            query = self._filter(self._fields_query(fields), filters)
+            result = await db.execute(query.offset(skip).limit(limit))
+            return [dict(row) for row in result.mappings()]
+        query = self._filtered_query(filters).options(*self._load_options(load))
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all()
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        filters: Dict = None,
+        sort_keys: Sequence[str] = ("created_at", "id"),
+        descending: bool = True,
+        load: LoadOption = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Get a page of items by keyset pagination.
+
+        Pass the returned ``next_cursor`` back to get the following page;
+        it is None on the last page. With ``fields``, items are column
+        dicts of those fields and the sort keys.
+        """
+        keys = [getattr(self.model, key) for key in sort_keys]
+        if fields:
+            query = self._filter(self._fields_query(fields, sort_keys), filters)
+        else:
+            query = self._filtered_query(filters).options(*self._load_options(load))
+        try:
+            return await paginate(
+                db, query, keys,
+                cursor=cursor, limit=limit, descending=descending, rows=bool(fields)
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def count(self, db: AsyncSession, *, filters: Dict = None) -> int:
+        """Count items matching the filters, in SQL."""
+        query = self._filter(select(func.count()).select_from(self.model), filters)
+        result = await db.execute(query)
+        return result.scalar_one()
+
+    async def count_by(self, db: AsyncSession, column: str, *, filters: Dict = None) -> Dict[Any, int]:
+        """Count items per value of a column; values without items are absent."""
+        group = getattr(self.model, column)
+        query = self._filter(select(group, func.count()).group_by(group), filters)
+        result = await db.execute(query)
+        return dict(result.all())
+
+    async def sum_by(
+        self,
+        db: AsyncSession,
+        column: str,
+        value_column: str,
+        *,
         filters: Dict = None
-    ) -> List[ModelType]:
-        """Get multiple items with optional filtering."""
-        query = db.query(self.model)
+    ) -> Dict[Any, Any]:
+        """Sum a column per value of another; values without items are absent."""
+        group = getattr(self.model, column)
+        query = self._filter(
+            select(group, func.sum(getattr(self.model, value_column))).group_by(group),
+            filters
+        )
+        result = await db.execute(query)
+        return dict(result.all())
+
+    async def stream_rows(
+        self,
+        db: AsyncSession,
+        *,
+        filters: Dict = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield matching rows as column dicts, ordered by primary key.
+
+        Rows come from a server-side cursor a batch at a time and skip the
+        ORM identity map, so memory stays flat for any number of rows.
+        """
+        query = self._filter(select(*self.stored_columns()), filters)
+        query = query.order_by(*self.model.__table__.primary_key.columns)
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for row in result.mappings():
+            yield dict(row)
+
+    def stored_columns(self) -> List[Column]:
+        """Table columns, without the ones the database generates."""
+        return [column for column in self.model.__table__.columns if column.computed is None]
+
+    def _load_options(self, load: LoadOption) -> List[Any]:
+        """Loader options for relationship paths or a load profile name.
+
+        Collections are loaded with selectinload, one query per relationship
+        whatever the number of rows; many-to-one with joinedload, in the
+        same query.
+        """
+        if not load:
+            return []
+        if isinstance(load, str):
+            load = self.load_profiles.get(load, [load])
+        options = []
+        for path in load:
+            option, model = None, self.model
+            for name in path.split("."):
+                relationship = inspect(model).relationships.get(name)
+                if relationship is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Unknown relationship: {path}"
+                    )
+                strategy = selectinload if relationship.uselist else joinedload
+                attr = getattr(model, name)
+                option = strategy(attr) if option is None else getattr(option, strategy.__name__)(attr)
+                model = relationship.mapper.class_
+            options.append(option)
+        return options
+
+    def _fields_query(self, fields: Sequence[str], sort_keys: Sequence[str] = ()) -> Select:
+        try:
+            return select_fields(self.model, fields, required=["id", *sort_keys])
+        except InvalidFields as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    def _filtered_query(self, filters: Optional[Dict]) -> Select:
+        return self._filter(select(self.model), filters)
+
+    def _filter(self, query: Select, filters: Optional[Dict]) -> Select:
+        # Plain where() clauses: the filter set varies per call, which lambda_stmt
+        # cannot cache safely; the compiled cache still covers repeated shapes
         if filters:
             for field, value in filters.items():
                 if hasattr(self.model, field):
-                    query = query.filter(getattr(self.model, field) == value)
-        return query.offset(skip).limit(limit).all()
+                    query = query.where(getattr(self.model, field) == value)
+        return query
 
-    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         """Create new item."""
         obj_in_data = obj_in.dict()
         db_obj = self.model(**obj_in_data)
         try:
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            await db.commit()
+            await db.refresh(db_obj)
+            await self.cache_entity(db_obj)
+            await self.invalidate_cached_responses()
             return db_obj
         except IntegrityError:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Database error while creating item"
             )
 
-    def update(
+    async def update(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
@@ -70,31 +348,195 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 setattr(db_obj, field, update_data[field])
         try:
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            await db.commit()
+            await db.refresh(db_obj)
+            await self.cache_entity(db_obj)
+            await self.invalidate_cached_responses()
             return db_obj
         except IntegrityError:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Database error while updating item"
             )
 
-    def remove(self, db: Session, *, id: int) -> ModelType:
+    async def remove(self, db: AsyncSession, *, id: int) -> ModelType:
         """Remove item."""
-        obj = db.query(self.model).get(id)
+        obj = await db.get(self.model, id)
         if not obj:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Item not found"
             )
         try:
-            db.delete(obj)
-            db.commit()
+            await db.delete(obj)
+            await db.commit()
+            await self.cache_missing(id)
+            await self.invalidate_cached_responses()
             return obj
         except IntegrityError:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Database error while deleting item"
-            )
\ No newline at end of file
+            )
+
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[CreateSchemaType],
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> BulkResult:
+        """Insert items in batches with INSERT ... RETURNING, in one transaction."""
+        async def write(rows: List[Dict[str, Any]]) -> List[ModelType]:
+            result = await db.execute(
+                insert(self.model).returning(self.model),
+                rows
+            )
+            return result.scalars().all()
+
+        rows = [obj_in.dict() for obj_in in objs_in]
+        return await self._write_batches(db, rows, batch_size, write)
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Mapping[Any, Union[UpdateSchemaType, Dict[str, Any]]],
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> BulkResult:
+        """Update items by id in batches, in one transaction.
+
+        ``objs_in`` maps ids to changes; unknown ids are reported as errors.
+        """
+        async def write(rows: List[Dict[str, Any]]) -> List[ModelType]:
+            ids = [row["id"] for row in rows]
+            result = await db.execute(select(self.model.id).where(self.model.id.in_(ids)))
+            existing = set(result.scalars())
+            found = [row for row in rows if row["id"] in existing]
+            if found:
+                # executemany of UPDATE ... WHERE id = ?, grouped by changed columns
+                await db.execute(update(self.model), found)
+            result = await db.execute(
+                select(self.model).where(self.model.id.in_(ids)).execution_options(populate_existing=True)
+            )
+            return result.scalars().all()
+
+        rows = [
+            {**(obj_in.dict(exclude_unset=True) if isinstance(obj_in, BaseModel) else obj_in), "id": id}
+            for id, obj_in in objs_in.items()
+        ]
+        result = await self._write_batches(db, rows, batch_size, write)
+        updated = {obj.id for obj in result.items}
+        failed = {error["index"] for error in result.errors}
+        for index, row in enumerate(rows):
+            if row["id"] not in updated and index not in failed:
+                result.errors.append({"index": index, "error": "Item not found"})
+        result.errors.sort(key=lambda error: error["index"])
+        return result
+
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[CreateSchemaType],
+        index_elements: Sequence[str],
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> BulkResult:
+        """Insert items, updating rows that already exist, in batches.
+
+        On the dialects of UPSERT_INSERTS (PostgreSQL, SQLite) this runs
+        INSERT ... ON CONFLICT (index_elements) DO UPDATE ... RETURNING, one
+        statement per batch and set of fields. Other dialects look each row
+        up by ``index_elements`` and insert or update it, in the same
+        savepoints. ``index_elements`` must be covered by a unique index.
+        """
+        upsert = UPSERT_INSERTS.get(db.bind.dialect.name)
+
+        async def write_row_by_row(rows: List[Dict[str, Any]]) -> List[ModelType]:
+            items: List[ModelType] = []
+            for row in rows:
+                match = [getattr(self.model, key) == row[key] for key in index_elements]
+                result = await db.execute(select(self.model).where(*match))
+                obj = result.scalars().first()
+                if obj is None:
+                    obj = self.model(**row)
+                    db.add(obj)
+                else:
+                    for key, value in row.items():
+                        setattr(obj, key, value)
+                await db.flush()
+                items.append(obj)
+            return items
+
+        async def write(rows: List[Dict[str, Any]]) -> List[ModelType]:
+            # A multi-row VALUES needs the same columns in every row, so rows
+            # of different schemas go in separate statements
+            groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+            for row in rows:
+                groups.setdefault(tuple(sorted(row)), []).append(row)
+            items: List[ModelType] = []
+            for columns, group in groups.items():
+                stmt = upsert(self.model).values(group)
+                changed = [key for key in columns if key not in index_elements]
+                if changed:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=index_elements,
+                        set_={key: stmt.excluded[key] for key in changed}
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+                result = await db.execute(
+                    stmt.returning(self.model).execution_options(populate_existing=True)
+                )
+                items.extend(result.scalars().all())
+            return items
+
+        rows = [obj_in.dict() for obj_in in objs_in]
+        return await self._write_batches(db, rows, batch_size, write if upsert else write_row_by_row)
+
+    async def _write_batches(
+        self,
+        db: AsyncSession,
+        rows: List[Dict[str, Any]],
+        batch_size: int,
+        write: Callable[[List[Dict[str, Any]]], Awaitable[List[ModelType]]]
+    ) -> BulkResult:
+        """Write rows batch by batch in one transaction, then commit.
+
+        Each batch runs in a savepoint. A batch the database rejects is
+        retried row by row, so only the offending rows are reported.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        items: List[ModelType] = []
+        errors: List[Dict[str, Any]] = []
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                async with db.begin_nested():
+                    items.extend(await write(batch))
+                continue
+            except DBAPIError as e:
+                if len(batch) == 1:
+                    errors.append({"index": start, "error": str(e.orig)})
+                    continue
+            for offset, row in enumerate(batch):
+                try:
+                    async with db.begin_nested():
+                        items.extend(await write([row]))
+                except DBAPIError as e:
+                    errors.append({"index": start + offset, "error": str(e.orig)})
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Database error while writing items"
+            )
+        await self.cache_entities(items)
+        if items:
+            await self.invalidate_cached_responses()
+        return BulkResult(items, errors)
@@ -3,51 +3,83 @@ CRUD operations for clients.
 """
 from typing import List, Optional
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.crud.base import CRUDBase
+from src.api.crud.base import ENTITY_CACHE_TTL, CRUDBase
+from src.api.pagination import InvalidCursor, Page
+from src.api.search import search
 from src.api.models.database_models import Client
 from src.api.models.schemas import ClientCreate, ClientUpdate
 
+# Search configuration
+SEARCH_PAGE_SIZE = 20
+
+# Eager-loading profiles, usable as load= on read methods
+LOAD_PROFILES = {
+    "deals": ["deals"],
+    "detail": ["deals", "deals.proposals", "proposals"],
+}
+
 class CRUDClient(CRUDBase[Client, ClientCreate, ClientUpdate]):
     """Client specific CRUD operations."""
     
-    def get_by_email(self, db: Session, *, email: str) -> Optional[Client]:
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[Client]:
         """Get client by email."""
-        return db.query(Client).filter(Client.email == email).first()
+        result = await db.execute(lambda_stmt(lambda: select(Client).where(Client.email == email)))
+        return result.scalars().first()
     
-    def get_by_status(self, db: Session, *, status: str) -> List[Client]:
+    async def get_by_status(self, db: AsyncSession, *, status: str) -> List[Client]:
         """Get all clients with a specific status."""
-        return db.query(Client).filter(Client.status == status).all()
+        result = await db.execute(
+            lambda_stmt(lambda: select(Client).where(Client.status == status))
+        )
+        return result.scalars().all()
     
-    def get_with_deals(self, db: Session, *, client_id: int) -> Optional[Client]:
+    async def get_with_deals(self, db: AsyncSession, *, client_id: int) -> Optional[Client]:
         """Get client with their deals."""
-        return db.query(Client).filter(Client.id == client_id).first()
+        return await self.get(db, client_id, load="deals")
     
-    def update_status(
+    async def update_status(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         client_id: int,
         status: str
     ) -> Optional[Client]:
         """Update client status."""
-        client = self.get(db, client_id)
+        client = await self.get(db, client_id)
         if not client:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Client not found"
             )
         client.status = status
-        db.commit()
-        db.refresh(client)
+        await db.commit()
+        await db.refresh(client)
+        await self.cache_entity(client)
+        await self.invalidate_cached_responses()
         return client
     
-    def search(self, db: Session, *, query: str) -> List[Client]:
-        """Search clients by name or company."""
-        return db.query(Client).filter(
-            (Client.name.ilike(f"%{query}%")) |
-            (Client.company.ilike(f"%{query}%"))
-        ).all()
+    async def search(
+        self,
+        db: AsyncSession,
+        *,
+        query: str,
+        limit: int = SEARCH_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """Search clients by name or company, best matches first.
+
+        Words match as prefixes of words in the name or company (full-text
+        index); misspellings and substrings match through the trigram
+        indexes. Pages are keyed on (rank, id).
+        """
+        try:
+            return await search(
+                db, Client, query, [Client.name, Client.company], cursor=cursor, limit=limit
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-client = CRUDClient(Client)
\ No newline at end of file
+client = CRUDClient(Client, cache_ttl=ENTITY_CACHE_TTL, load_profiles=LOAD_PROFILES)
\ No newline at end of file
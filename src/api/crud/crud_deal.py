@@ -3,48 +3,66 @@ CRUD operations for deals.
 """
 from typing import List, Optional
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.crud.base import CRUDBase
+from src.api.crud.base import ENTITY_CACHE_TTL, CRUDBase
 from src.api.models.database_models import Deal
 from src.api.models.schemas import DealCreate, DealUpdate
 
+# Eager-loading profiles, usable as load= on read methods
+LOAD_PROFILES = {
+    "detail": ["client", "owner", "proposals"],
+}
+
 class CRUDDeal(CRUDBase[Deal, DealCreate, DealUpdate]):
     """Deal specific CRUD operations."""
     
-    def get_by_client(self, db: Session, *, client_id: int) -> List[Deal]:
+    async def get_by_client(self, db: AsyncSession, *, client_id: int) -> List[Deal]:
         """Get all deals for a specific client."""
-        return db.query(Deal).filter(Deal.client_id == client_id).all()
+        result = await db.execute(
+            lambda_stmt(lambda: select(Deal).where(Deal.client_id == client_id))
+        )
+        return result.scalars().all()
     
-    def get_by_owner(self, db: Session, *, owner_id: int) -> List[Deal]:
+    async def get_by_owner(self, db: AsyncSession, *, owner_id: int) -> List[Deal]:
         """Get all deals for a specific owner."""
-        return db.query(Deal).filter(Deal.owner_id == owner_id).all()
+        result = await db.execute(
+            lambda_stmt(lambda: select(Deal).where(Deal.owner_id == owner_id))
+        )
+        return result.scalars().all()
     
-    def get_by_status(self, db: Session, *, status: str) -> List[Deal]:
+    async def get_by_status(self, db: AsyncSession, *, status: str) -> List[Deal]:
         """Get all deals with a specific status."""
-        return db.query(Deal).filter(Deal.status == status).all()
+        result = await db.execute(lambda_stmt(lambda: select(Deal).where(Deal.status == status)))
+        return result.scalars().all()
     
-    def get_by_priority(self, db: Session, *, priority: str) -> List[Deal]:
+    async def get_by_priority(self, db: AsyncSession, *, priority: str) -> List[Deal]:
         """Get all deals with a specific priority."""
-        return db.query(Deal).filter(Deal.priority == priority).all()
+        result = await db.execute(
+            lambda_stmt(lambda: select(Deal).where(Deal.priority == priority))
+        )
+        return result.scalars().all()
     
-    def update_status(
+    async def update_status(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         deal_id: int,
         status: str
     ) -> Optional[Deal]:
         """Update deal status."""
-        deal = self.get(db, deal_id)
+        deal = await self.get(db, deal_id)
         if not deal:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Deal not found"
             )
         deal.status = status
-        db.commit()
-        db.refresh(deal)
+        await db.commit()
+        await db.refresh(deal)
+        await self.cache_entity(deal)
+        await self.invalidate_cached_responses()
         return deal
 
-deal = CRUDDeal(Deal)
\ No newline at end of file
+deal = CRUDDeal(Deal, cache_ttl=ENTITY_CACHE_TTL, load_profiles=LOAD_PROFILES)
\ No newline at end of file
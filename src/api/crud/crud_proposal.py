@@ -3,59 +3,93 @@ CRUD operations for proposals.
 """
 from typing import List, Optional
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
-from src.api.crud.base import CRUDBase
+from src.api.crud.base import ENTITY_CACHE_TTL, CRUDBase
 from src.api.models.database_models import Proposal
 from src.api.models.schemas import ProposalCreate, ProposalUpdate
 
+# Eager-loading profiles, usable as load= on read methods
+LOAD_PROFILES = {
+    "detail": ["client", "deal", "owner"],
+}
+
 class CRUDProposal(CRUDBase[Proposal, ProposalCreate, ProposalUpdate]):
     """Proposal specific CRUD operations."""
     
-    def get_by_client(self, db: Session, *, client_id: int) -> List[Proposal]:
+    async def get_by_client(self, db: AsyncSession, *, client_id: int) -> List[Proposal]:
         """Get all proposals for a specific client."""
-        return db.query(Proposal).filter(Proposal.client_id == client_id).all()
+        result = await db.execute(
+            lambda_stmt(lambda: select(Proposal).where(Proposal.client_id == client_id))
+        )
+        return result.scalars().all()
     
-    def get_by_deal(self, db: Session, *, deal_id: int) -> List[Proposal]:
+    async def get_by_deal(self, db: AsyncSession, *, deal_id: int) -> List[Proposal]:
         """Get all proposals for a specific deal."""
-        return db.query(Proposal).filter(Proposal.deal_id == deal_id).all()
+        result = await db.execute(
+            lambda_stmt(lambda: select(Proposal).where(Proposal.deal_id == deal_id))
+        )
+        return result.scalars().all()
     
-    def get_by_owner(self, db: Session, *, owner_id: int) -> List[Proposal]:
+    async def get_by_owner(self, db: AsyncSession, *, owner_id: int) -> List[Proposal]:
         """Get all proposals for a specific owner."""
-        return db.query(Proposal).filter(Proposal.owner_id == owner_id).all()
+        result = await db.execute(
+            lambda_stmt(lambda: select(Proposal).where(Proposal.owner_id == owner_id))
+        )
+        return result.scalars().all()
     
-    def get_by_status(self, db: Session, *, status: str) -> List[Proposal]:
+    async def get_by_status(self, db: AsyncSession, *, status: str) -> List[Proposal]:
         """Get all proposals with a specific status."""
-        return db.query(Proposal).filter(Proposal.status == status).all()
+        result = await db.execute(
+            lambda_stmt(lambda: select(Proposal).where(Proposal.status == status))
+        )
+        return result.scalars().all()
     
-    def get_valid(self, db: Session) -> List[Proposal]:
+    async def get_valid(self, db: AsyncSession) -> List[Proposal]:
         """Get all valid proposals (not expired)."""
         now = datetime.utcnow()
-        return db.query(Proposal).filter(Proposal.valid_until > now).all()
+        result = await db.execute(
+            lambda_stmt(lambda: select(Proposal).where(Proposal.valid_until > now))
+        )
+        return result.scalars().all()
     
-    def get_expired(self, db: Session) -> List[Proposal]:
+    async def get_expired(self, db: AsyncSession) -> List[Proposal]:
         """Get all expired proposals."""
         now = datetime.utcnow()
-        return db.query(Proposal).filter(Proposal.valid_until <= now).all()
+        result = await db.execute(
+            lambda_stmt(lambda: select(Proposal).where(Proposal.valid_until <= now))
+        )
+        return result.scalars().all()
+    
+    async def count_expired(self, db: AsyncSession) -> int:
+        """Count expired proposals."""
+        now = datetime.utcnow()
+        result = await db.execute(
+            lambda_stmt(lambda: select(func.count()).select_from(Proposal).where(Proposal.valid_until <= now))
+        )
+        return result.scalar_one()
     
-    def update_status(
+    async def update_status(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         proposal_id: int,
         status: str
     ) -> Optional[Proposal]:
         """Update proposal status."""
-        proposal = self.get(db, proposal_id)
+        proposal = await self.get(db, proposal_id)
         if not proposal:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Proposal not found"
             )
         proposal.status = status
-        db.commit()
-        db.refresh(proposal)
+        await db.commit()
+        await db.refresh(proposal)
+        await self.cache_entity(proposal)
+        await self.invalidate_cached_responses()
         return proposal
 
-proposal = CRUDProposal(Proposal)
\ No newline at end of file
+proposal = CRUDProposal(Proposal, cache_ttl=ENTITY_CACHE_TTL, load_profiles=LOAD_PROFILES)
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Streaming exports.
+
+Rows are read from a server-side cursor and encoded a chunk at a time, so
+memory stays flat whatever the table size. StreamingResponse awaits each
+send, so the cursor is only advanced as fast as the client reads
+(backpressure), and optionally gzip-compressed on the fly.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Sequence
+from uuid import UUID
+import csv
+import io
+import json
+import zlib
+
+from fastapi.responses import StreamingResponse
+
+# Configuration
+EXPORT_CHUNK_ROWS = 500  # rows encoded per chunk sent to the client
+GZIP_LEVEL = 6
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _json_value(value: Any) -> Any:
+    """Encode values the JSON encoder does not handle natively."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_value)
+    return value
+
+async def _chunks(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Group rows into lists of EXPORT_CHUNK_ROWS."""
+    chunk = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+async def ndjson_lines(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode rows as newline-delimited JSON."""
+    async for chunk in _chunks(rows):
+        yield "".join(
+            json.dumps(row, default=_json_value, separators=(",", ":")) + "\n" for row in chunk
+        ).encode()
+
+async def csv_lines(rows: AsyncIterator[Dict[str, Any]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    """Encode rows as CSV with a header line."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for chunk in _chunks(rows):
+        writer.writerows([_csv_value(row[column]) for column in columns] for row in chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, for empty exports
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip a byte stream incrementally."""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_response(
+    rows: AsyncIterator[Dict[str, Any]],
+    columns: Sequence[str],
+    *,
+    format: str,
+    filename: str,
+    gzip: bool = False
+) -> StreamingResponse:
+    """StreamingResponse encoding rows as NDJSON or CSV."""
+    body = csv_lines(rows, columns) if format == "csv" else ndjson_lines(rows)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{format}"'}
+    if gzip:
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=EXPORT_FORMATS[format], headers=headers)
@@ -0,0 +1,47 @@
+"""
+Sparse fieldsets.
+
+List endpoints accept ``fields=id,title,status`` to select only those
+columns. The rows are read as tuples and serialized straight to JSON
+without building ORM objects, so large Text columns such as descriptions
+or webhook payloads are neither fetched nor held in memory.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from fastapi import Response
+from sqlalchemy import Select, inspect, select
+
+from src.api.pagination import NEXT_CURSOR_HEADER
+from src.api.serialization import to_json
+
+class InvalidFields(ValueError):
+    """Raised for field names that are not columns of the model."""
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Field names of a comma-separated fields= parameter, or None for all."""
+    if not fields:
+        return None
+    return [name.strip() for name in fields.split(",") if name.strip()] or None
+
+def field_columns(model: Type[Any], fields: Sequence[str], required: Sequence[str] = ("id",)) -> List[Any]:
+    """Model columns for field names, after the required ones (primary and sort keys)."""
+    columns = {attr.key for attr in inspect(model).column_attrs}
+    unknown = [name for name in fields if name not in columns]
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+    return [getattr(model, name) for name in dict.fromkeys([*required, *fields])]
+
+def select_fields(
+    model: Type[Any],
+    fields: Optional[Sequence[str]],
+    required: Sequence[str] = ("id",)
+) -> Select:
+    """SELECT of the model, or of only the given fields."""
+    if not fields:
+        return select(model)
+    return select(*field_columns(model, fields, required))
+
+def rows_response(rows: List[Dict[str, Any]], next_cursor: Optional[str] = None) -> Response:
+    """JSON response of column dicts, bypassing response_model validation."""
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return Response(content=to_json(rows), media_type="application/json", headers=headers)
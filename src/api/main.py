@@ -6,6 +6,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional
 from datetime import datetime, timedelta
 
+from .cache import close_cache, start_invalidation_listener
+from .pagination import NEXT_CURSOR_HEADER
+from .query_metrics import QueryMetricsMiddleware
 from .models import (
     Dashboard, DashboardMetrics, PipelineStats,
     Deal, Client, Proposal, EmailStats
@@ -24,8 +27,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Query count and DB time per request (Server-Timing header and logs)
+app.add_middleware(QueryMetricsMiddleware)
+
+# Local cache tier: apply other workers' invalidations, release connections on exit
+app.add_event_handler("startup", start_invalidation_listener)
+app.add_event_handler("shutdown", close_cache)
+
 # Rotas do Dashboard
 @app.get("/api/dashboard", response_model=Dashboard)
 async def get_dashboard():
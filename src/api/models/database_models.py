@@ -1,8 +1,9 @@
 """
 SQLAlchemy models for database tables.
 """
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, DateTime, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, Computed, ForeignKey, Index, Integer, String, Float, DateTime, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from src.api.database import Base
@@ -27,6 +28,18 @@ class User(Base):
 class Client(Base):
     """Client model."""
     __tablename__ = "clients"
+    __table_args__ = (
+        Index("ix_clients_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram indexes serve fuzzy (%) and substring (ILIKE) matches
+        Index(
+            "ix_clients_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_clients_company_trgm", "company",
+            postgresql_using="gin", postgresql_ops={"company": "gin_trgm_ops"}
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
@@ -37,6 +50,12 @@ class Client(Base):
     notes = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Generated by the database for client search; deferred so rows never load it
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(company, '')), 'B')",
+        persisted=True
+    )))
 
     # Relationships
     deals = relationship("Deal", back_populates="client")
@@ -45,6 +64,11 @@ class Client(Base):
 class Deal(Base):
     """Deal model."""
     __tablename__ = "deals"
+    __table_args__ = (
+        Index("ix_deals_owner_id_status", "owner_id", "status"),
+        Index("ix_deals_status", "status"),
+        Index("ix_deals_client_id", "client_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -67,6 +91,13 @@ class Deal(Base):
 class Proposal(Base):
     """Proposal model."""
     __tablename__ = "proposals"
+    __table_args__ = (
+        Index("ix_proposals_status_valid_until", "status", "valid_until"),
+        Index("ix_proposals_valid_until", "valid_until"),
+        Index("ix_proposals_owner_id_status", "owner_id", "status"),
+        Index("ix_proposals_deal_id", "deal_id"),
+        Index("ix_proposals_client_id", "client_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -4,7 +4,7 @@ Integration models and schemas.
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 
 from src.api.database import Base
@@ -34,6 +34,9 @@ class Integration(Base):
 class IntegrationSyncLog(Base):
     """Integration sync log database model."""
     __tablename__ = "integration_sync_logs"
+    __table_args__ = (
+        Index("ix_integration_sync_logs_integration_id_started_at_id", "integration_id", "started_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     integration_id = Column(Integer, ForeignKey("integrations.id"))
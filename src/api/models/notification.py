@@ -4,7 +4,7 @@ Notification models and schemas.
 from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index, Text, text
 from sqlalchemy.orm import relationship
 
 from src.api.database import Base
@@ -12,6 +12,14 @@ from src.api.database import Base
 class Notification(Base):
     """Notification database model."""
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Unread-only listings and mark-all-as-read only touch the (small) unread set
+        Index(
+            "ix_notifications_user_id_created_at_id_unread", "user_id", "created_at", "id",
+            postgresql_where=text("read = false")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -4,7 +4,7 @@ Webhook models and schemas.
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, HttpUrl
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 
 from src.api.database import Base
@@ -17,7 +17,7 @@ class Webhook(Base):
     name = Column(String, nullable=False)
     url = Column(String, nullable=False)
     description = Column(Text)
-    events = Column(JSON, nullable=False)  # List of event types to trigger webhook
+    events = Column(JSON, nullable=False)  # List of event types to trigger webhook, mirrored in webhook_subscriptions
     headers = Column(JSON)  # Custom headers to send
     is_active = Column(Boolean, default=True)
     secret_key = Column(String)  # For signature verification
@@ -30,9 +30,23 @@ class Webhook(Base):
     creator = relationship("User", back_populates="webhooks")
     deliveries = relationship("WebhookDelivery", back_populates="webhook")
 
+class WebhookSubscription(Base):
+    """Event type a webhook subscribes to, for indexed subscriber lookups."""
+    __tablename__ = "webhook_subscriptions"
+    __table_args__ = (
+        Index("ix_webhook_subscriptions_webhook_id", "webhook_id"),
+    )
+
+    # Primary key order serves "which webhooks subscribe to this event"
+    event_type = Column(String, primary_key=True)
+    webhook_id = Column(Integer, ForeignKey("webhooks.id", ondelete="CASCADE"), primary_key=True)
+
 class WebhookDelivery(Base):
     """Webhook delivery attempt database model."""
     __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        Index("ix_webhook_deliveries_webhook_id_created_at_id", "webhook_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     webhook_id = Column(Integer, ForeignKey("webhooks.id"))
@@ -0,0 +1,96 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are selected with a row-value comparison on an indexed sort key such
+as (created_at, id), so a deep page costs the same as the first one and rows
+inserted meanwhile cannot shift others between pages. The cursor handed to
+clients is opaque: URL-safe base64 of the last row's sort key.
+"""
+from datetime import date, datetime
+from typing import Any, List, NamedTuple, Optional, Sequence
+import base64
+import binascii
+import json
+
+from fastapi import Response
+from sqlalchemy import Date, DateTime, Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+# Configuration
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"  # response header list endpoints expose the cursor in
+
+class InvalidCursor(ValueError):
+    """Raised for cursors that were not issued for this sort key."""
+
+class Page(NamedTuple):
+    """One page of rows and the cursor of the next page, if any."""
+    items: List[Any]
+    next_cursor: Optional[str]
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a sort key value."""
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute]) -> List[Any]:
+    """Sort key value of a cursor, typed after the key columns."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("Malformed cursor")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursor("Cursor does not match the sort key")
+    try:
+        for i, column in enumerate(columns):
+            column_type = column.type
+            if isinstance(values[i], str) and isinstance(column_type, DateTime):
+                values[i] = datetime.fromisoformat(values[i])
+            elif isinstance(values[i], str) and isinstance(column_type, Date):
+                values[i] = date.fromisoformat(values[i])
+    except ValueError:
+        raise InvalidCursor("Malformed cursor")
+    return values
+
+def page_items(response: Response, page: Page) -> List[Any]:
+    """Items of a page, exposing the next cursor as a response header."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    keys: Sequence[InstrumentedAttribute],
+    *,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    descending: bool = True,
+    rows: bool = False
+) -> Page:
+    """Run query one page at a time, ordered by the (unique, non-null) keys.
+
+    ``keys`` must end in a unique column, e.g. (created_at, id), and should
+    be the trailing columns of an index so the page is an index range scan.
+    With ``rows``, query selects columns (including the keys) and items are
+    column dicts instead of entities.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        after = tuple_(*keys)
+        bound = tuple_(*decode_cursor(cursor, keys))
+        query = query.where(after < bound if descending else after > bound)
+    query = query.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    # One extra row tells whether another page follows
+    result = await db.execute(query.limit(limit + 1))
+    items = [dict(row) for row in result.mappings()] if rows else result.scalars().all()
+    if len(items) <= limit:
+        return Page(items, None)
+    items = items[:limit]
+    last = items[-1]
+    return Page(items, encode_cursor([last[key.key] if rows else getattr(last, key.key) for key in keys]))
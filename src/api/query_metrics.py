@@ -0,0 +1,152 @@
+"""
+Per-request SQL instrumentation.
+
+Engine hooks time every statement into the stats of the current request.
+QueryMetricsMiddleware reports them as a log line once the response is
+complete and, unless the body is streamed, as a Server-Timing header. In
+development it also warns about statements repeated often enough to
+suggest an N+1 query pattern.
+"""
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import os
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Configuration
+DEV_MODE = os.getenv("APP_ENV", "production") == "development"
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))  # repeats of one statement shape
+SLOW_STATEMENT_LOG_LENGTH = 500  # characters of the slowest statement that are logged
+
+logger = logging.getLogger(__name__)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<!\$)\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN\s*\((?:\s*(?:\?|%\(\w+\)s|%s|\$\d+|:\w+)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions differing only in values match."""
+    shape = _LITERALS.sub("?", statement)
+    shape = _IN_LISTS.sub("IN (?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+class QueryStats:
+    """Statements executed while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        """Record one executed statement."""
+        self.count += 1
+        self.total_time += duration
+        if duration >= self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than threshold times."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (durations in milliseconds)."""
+        return (
+            f'db;dur={self.total_time * 1000:.2f};desc="{self.count} queries", '
+            f'db-slowest;dur={self.slowest_time * 1000:.2f}'
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Fields for structured logging."""
+        return {
+            "query_count": self.count,
+            "db_time_ms": round(self.total_time * 1000, 2),
+            "slowest_query_ms": round(self.slowest_time * 1000, 2),
+            "slowest_query": (self.slowest_statement or "")[:SLOW_STATEMENT_LOG_LENGTH],
+        }
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Stats of the request being handled, if any."""
+    return _current_stats.get()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute, so drop its start time here
+    starts = context.connection.info.get("query_start_time") if context.connection is not None else None
+    if starts and context.statement is not None:
+        starts.pop()
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement run through an engine (use .sync_engine for async engines)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+class QueryMetricsMiddleware:
+    """ASGI middleware reporting SQL statistics for each HTTP request."""
+
+    def __init__(self, app, n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD, dev_mode: bool = DEV_MODE):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.dev_mode = dev_mode
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                # Streamed bodies (no content-length) still run queries after
+                # the headers are sent; their totals are only logged
+                if any(name.lower() == b"content-length" for name, _ in headers):
+                    headers.append((b"server-timing", stats.server_timing().encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope, stats: QueryStats) -> None:
+        fields = {"method": scope.get("method"), "path": scope.get("path"), **stats.as_dict()}
+        logger.info(
+            "sql method=%s path=%s query_count=%d db_time_ms=%.2f slowest_query_ms=%.2f",
+            fields["method"], fields["path"], stats.count,
+            fields["db_time_ms"], fields["slowest_query_ms"],
+            extra={"sql": fields}
+        )
+        if not self.dev_mode:
+            return
+        for shape, count in stats.repeated_shapes(self.n_plus_one_threshold):
+            logger.warning(
+                "Possible N+1 query: %s %s ran %d times: %s",
+                fields["method"], fields["path"], count, shape,
+                extra={"sql": {**fields, "repeated_query": shape, "repeat_count": count}}
+            )
@@ -2,10 +2,10 @@
 Dashboard router with caching.
 """
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 
-from src.api.database import get_db
+from src.api.database import get_async_read_db
 from src.api.auth.router import get_current_user
 from src.api.models.database_models import User
 from src.api.cache import cache_response, rate_limit
@@ -16,21 +16,26 @@ from src.api.crud.crud_proposal import proposal
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 @router.get("")
-@cache_response(expire=300)  # Cache for 5 minutes
 @rate_limit("dashboard_stats")
+@cache_response(
+    expire=300,  # Cache for 5 minutes
+    key_params=["current_user.id"],
+    tags=["deals", "proposals", "clients", "user:{current_user.id}"]
+)
 async def get_dashboard(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get dashboard statistics."""
     # Get basic metrics
-    total_deals = len(deal.get_by_owner(db, owner_id=current_user.id))
-    active_deals = len(deal.get_by_status(db, status="active"))
-    total_proposals = len(proposal.get_by_owner(db, owner_id=current_user.id))
-    total_clients = len(client.get_multi(db))
+    deals_by_status = await deal.count_by(db, "status")
+    total_deals = await deal.count(db, filters={"owner_id": current_user.id})
+    active_deals = deals_by_status.get("active", 0)
+    total_proposals = await proposal.count(db, filters={"owner_id": current_user.id})
+    total_clients = await client.count(db)
 
     # Get recent activity
-    recent_deals = deal.get_multi(
+    recent_deals = await deal.get_multi(
         db,
         filters={"owner_id": current_user.id},
         limit=5
@@ -38,16 +43,17 @@ async def get_dashboard(
     
     # Get pipeline stats
     pipeline_stats = {
-        status: len(deal.get_by_status(db, status=status))
+        status: deals_by_status.get(status, 0)
         for status in ["new", "contacted", "proposal_sent", "negotiation", "closed"]
     }
     
     # Get proposal stats
+    proposals_by_status = await proposal.count_by(db, "status")
     proposal_stats = {
-        "sent": len(proposal.get_by_status(db, status="sent")),
-        "accepted": len(proposal.get_by_status(db, status="accepted")),
-        "rejected": len(proposal.get_by_status(db, status="rejected")),
-        "expired": len(proposal.get_expired(db))
+        "sent": proposals_by_status.get("sent", 0),
+        "accepted": proposals_by_status.get("accepted", 0),
+        "rejected": proposals_by_status.get("rejected", 0),
+        "expired": await proposal.count_expired(db)
     }
 
     return {
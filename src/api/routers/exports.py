@@ -0,0 +1,79 @@
+"""
+Export endpoints.
+
+Whole tables are streamed as NDJSON or CSV from the read replica; filters
+match the crud get_by_* helpers.
+"""
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.database import get_async_read_db
+from src.api.auth.router import get_current_user
+from src.api.models.database_models import User
+from src.api.crud.base import CRUDBase
+from src.api.crud.crud_client import client
+from src.api.crud.crud_deal import deal
+from src.api.crud.crud_proposal import proposal
+from src.api.export import export_response
+
+router = APIRouter(prefix="/api/exports", tags=["exports"])
+
+FORMAT_PATTERN = "^(ndjson|csv)$"
+
+def _export(
+    db: AsyncSession,
+    crud: CRUDBase,
+    filename: str,
+    filters: Dict[str, Any],
+    format: str,
+    gzip: bool
+) -> StreamingResponse:
+    # The session stays open until the response body has been sent
+    filters = {field: value for field, value in filters.items() if value is not None}
+    columns = [column.name for column in crud.stored_columns()]
+    rows = crud.stream_rows(db, filters=filters)
+    return export_response(rows, columns, format=format, filename=filename, gzip=gzip)
+
+@router.get("/clients")
+async def export_clients(
+    status: Optional[str] = None,
+    email: Optional[str] = None,
+    format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+    gzip: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Export clients."""
+    return _export(db, client, "clients", {"status": status, "email": email}, format, gzip)
+
+@router.get("/deals")
+async def export_deals(
+    client_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+    gzip: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Export deals."""
+    filters = {"client_id": client_id, "owner_id": owner_id, "status": status, "priority": priority}
+    return _export(db, deal, "deals", filters, format, gzip)
+
+@router.get("/proposals")
+async def export_proposals(
+    client_id: Optional[int] = None,
+    deal_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+    status: Optional[str] = None,
+    format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+    gzip: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Export proposals."""
+    filters = {"client_id": client_id, "deal_id": deal_id, "owner_id": owner_id, "status": status}
+    return _export(db, proposal, "proposals", filters, format, gzip)
@@ -2,10 +2,10 @@
 Integration endpoints.
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.database import get_db
+from src.api.database import get_async_db
 from src.api.auth.router import get_current_user
 from src.api.models.database_models import User
 from src.api.models.integration import (
@@ -15,6 +15,8 @@ from src.api.models.integration import (
     IntegrationSyncLogRead,
     IntegrationProvider
 )
+from src.api.fieldsets import parse_fields, rows_response
+from src.api.pagination import page_items
 from src.api.services.integration_service import IntegrationService
 from src.api.integrations.providers import get_provider, get_providers_by_type
 
@@ -45,7 +47,7 @@ async def get_provider_info(
 async def create_integration(
     integration: IntegrationCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new integration."""
     try:
@@ -62,21 +64,21 @@ async def get_integrations(
     type: Optional[str] = None,
     provider: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all integrations."""
     integration_service = IntegrationService(db)
-    return integration_service.get_integrations(type, provider)
+    return await integration_service.get_integrations(type, provider)
 
 @router.get("/{integration_id}", response_model=IntegrationRead)
 async def get_integration(
     integration_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get specific integration."""
     integration_service = IntegrationService(db)
-    integration = integration_service.get_integration(integration_id)
+    integration = await integration_service.get_integration(integration_id)
     if not integration:
         raise HTTPException(status_code=404, detail="Integration not found")
     return integration
@@ -86,7 +88,7 @@ async def update_integration(
     integration_id: int,
     integration_update: IntegrationUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an integration."""
     try:
@@ -105,12 +107,12 @@ async def update_integration(
 async def delete_integration(
     integration_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an integration."""
     try:
         integration_service = IntegrationService(db)
-        if integration_service.delete_integration(integration_id):
+        if await integration_service.delete_integration(integration_id):
             return {"message": "Integration deleted"}
         raise HTTPException(status_code=404, detail="Integration not found")
     except ValueError as e:
@@ -121,7 +123,7 @@ async def sync_integration(
     integration_id: int,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Trigger integration sync."""
     try:
@@ -133,13 +135,23 @@ async def sync_integration(
 @router.get("/{integration_id}/sync-logs", response_model=List[IntegrationSyncLogRead])
 async def get_sync_logs(
     integration_id: int,
+    response: Response,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,status"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get integration sync logs."""
+    """Get integration sync logs, newest first."""
     integration_service = IntegrationService(db)
-    integration = integration_service.get_integration(integration_id)
+    integration = await integration_service.get_integration(integration_id)
     if not integration:
         raise HTTPException(status_code=404, detail="Integration not found")
-    return integration_service.get_sync_logs(integration_id, limit)
\ No newline at end of file
+    fields = parse_fields(fields)
+    try:
+        page = await integration_service.get_sync_logs(integration_id, limit, cursor, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fields:
+        return rows_response(page.items, page.next_cursor)
+    return page_items(response, page)
\ No newline at end of file
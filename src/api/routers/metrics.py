@@ -0,0 +1,25 @@
+"""
+Operational metrics endpoints.
+"""
+from fastapi import APIRouter, Depends
+
+from src.api.auth.router import get_current_user
+from src.api.cache import get_cache_stats
+from src.api.database import get_pool_metrics
+from src.api.models.database_models import User
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+@router.get("/database")
+async def get_database_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    """Get connection pool occupancy and checkout wait metrics."""
+    return get_pool_metrics()
+
+@router.get("/cache")
+async def get_cache_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    """Get cache hit and miss counters."""
+    return get_cache_stats()
@@ -1,39 +1,53 @@
 """
 Notification endpoints.
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.database import get_db
+from src.api.database import get_async_db
 from src.api.auth.router import get_current_user
 from src.api.models.database_models import User
 from src.api.models.notification import NotificationCreate, NotificationRead
+from src.api.fieldsets import parse_fields, rows_response
+from src.api.pagination import page_items
 from src.api.services.notification_service import NotificationService
 
 router = APIRouter(prefix="/api/notifications", tags=["notifications"])
 
 @router.get("", response_model=List[NotificationRead])
 async def get_notifications(
+    response: Response,
     unread_only: bool = Query(False, description="Only return unread notifications"),
     limit: int = Query(50, description="Maximum number of notifications to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,status"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     background_tasks: BackgroundTasks = BackgroundTasks()
 ):
-    """Get user's notifications."""
+    """Get user's notifications, newest first."""
     notification_service = NotificationService(db, background_tasks)
-    return notification_service.get_user_notifications(
-        user_id=current_user.id,
-        unread_only=unread_only,
-        limit=limit
-    )
+    fields = parse_fields(fields)
+    try:
+        page = await notification_service.get_user_notifications(
+            user_id=current_user.id,
+            unread_only=unread_only,
+            limit=limit,
+            cursor=cursor,
+            fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fields:
+        return rows_response(page.items, page.next_cursor)
+    return page_items(response, page)
 
 @router.post("", response_model=NotificationRead)
 async def create_notification(
     notification: NotificationCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     background_tasks: BackgroundTasks = BackgroundTasks()
 ):
     """Create a new notification."""
@@ -50,12 +64,12 @@ async def create_notification(
 async def mark_as_read(
     notification_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     background_tasks: BackgroundTasks = BackgroundTasks()
 ):
     """Mark a notification as read."""
     notification_service = NotificationService(db, background_tasks)
-    notification = notification_service.mark_as_read(notification_id, current_user.id)
+    notification = await notification_service.mark_as_read(notification_id, current_user.id)
     
     if not notification:
         raise HTTPException(
@@ -68,19 +82,19 @@ async def mark_as_read(
 @router.post("/mark-all-read")
 async def mark_all_as_read(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     background_tasks: BackgroundTasks = BackgroundTasks()
 ):
     """Mark all notifications as read."""
     notification_service = NotificationService(db, background_tasks)
-    count = notification_service.mark_all_as_read(current_user.id)
+    count = await notification_service.mark_all_as_read(current_user.id)
     return {"message": f"Marked {count} notifications as read"}
 
 @router.delete("/cleanup")
 async def cleanup_notifications(
     days: int = Query(30, description="Delete read notifications older than this many days"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     background_tasks: BackgroundTasks = BackgroundTasks()
 ):
     """Clean up old notifications."""
@@ -91,5 +105,5 @@ async def cleanup_notifications(
         )
     
     notification_service = NotificationService(db, background_tasks)
-    count = notification_service.cleanup_old_notifications(days)
+    count = await notification_service.cleanup_old_notifications(days)
     return {"message": f"Deleted {count} old notifications"}
\ No newline at end of file
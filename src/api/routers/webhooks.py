@@ -2,10 +2,10 @@
 Webhook endpoints.
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.database import get_db
+from src.api.database import get_async_db
 from src.api.auth.router import get_current_user
 from src.api.models.database_models import User
 from src.api.models.webhook import (
@@ -15,6 +15,8 @@ from src.api.models.webhook import (
     WebhookDeliveryRead,
     WebhookEvent
 )
+from src.api.fieldsets import parse_fields, rows_response
+from src.api.pagination import page_items
 from src.api.services.webhook_service import WebhookService
 
 router = APIRouter(prefix="/api/webhooks", tags=["webhooks"])
@@ -23,12 +25,12 @@ router = APIRouter(prefix="/api/webhooks", tags=["webhooks"])
 async def create_webhook(
     webhook: WebhookCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new webhook."""
     try:
         webhook_service = WebhookService(db)
-        return webhook_service.create_webhook(webhook, current_user.id)
+        return await webhook_service.create_webhook(webhook, current_user.id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -37,21 +39,21 @@ async def get_webhooks(
     event_type: Optional[str] = None,
     active_only: bool = True,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all webhooks."""
     webhook_service = WebhookService(db)
-    return webhook_service.get_webhooks(event_type, active_only)
+    return await webhook_service.get_webhooks(event_type, active_only)
 
 @router.get("/{webhook_id}", response_model=WebhookRead)
 async def get_webhook(
     webhook_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get specific webhook."""
     webhook_service = WebhookService(db)
-    webhook = webhook_service.get_webhook(webhook_id)
+    webhook = await webhook_service.get_webhook(webhook_id)
     if not webhook:
         raise HTTPException(status_code=404, detail="Webhook not found")
     return webhook
@@ -61,12 +63,12 @@ async def update_webhook(
     webhook_id: int,
     webhook_update: WebhookUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a webhook."""
     try:
         webhook_service = WebhookService(db)
-        webhook = webhook_service.update_webhook(webhook_id, webhook_update)
+        webhook = await webhook_service.update_webhook(webhook_id, webhook_update)
         if not webhook:
             raise HTTPException(status_code=404, detail="Webhook not found")
         return webhook
@@ -77,12 +79,12 @@ async def update_webhook(
 async def delete_webhook(
     webhook_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a webhook."""
     try:
         webhook_service = WebhookService(db)
-        if webhook_service.delete_webhook(webhook_id):
+        if await webhook_service.delete_webhook(webhook_id):
             return {"message": "Webhook deleted"}
         raise HTTPException(status_code=404, detail="Webhook not found")
     except ValueError as e:
@@ -93,7 +95,7 @@ async def trigger_webhook_event(
     event: WebhookEvent,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Trigger a webhook event."""
     webhook_service = WebhookService(db)
@@ -103,22 +105,32 @@ async def trigger_webhook_event(
 @router.get("/{webhook_id}/deliveries", response_model=List[WebhookDeliveryRead])
 async def get_webhook_deliveries(
     webhook_id: int,
+    response: Response,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,status"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get webhook delivery history."""
+    """Get webhook delivery history, newest first."""
     webhook_service = WebhookService(db)
-    webhook = webhook_service.get_webhook(webhook_id)
+    webhook = await webhook_service.get_webhook(webhook_id)
     if not webhook:
         raise HTTPException(status_code=404, detail="Webhook not found")
-    return webhook_service.get_deliveries(webhook_id, limit)
+    fields = parse_fields(fields)
+    try:
+        page = await webhook_service.get_deliveries(webhook_id, limit, cursor, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fields:
+        return rows_response(page.items, page.next_cursor)
+    return page_items(response, page)
 
 @router.post("/deliveries/{delivery_id}/retry", response_model=WebhookDeliveryRead)
 async def retry_webhook_delivery(
     delivery_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Retry a failed webhook delivery."""
     webhook_service = WebhookService(db)
@@ -0,0 +1,76 @@
+"""
+Ranked text search.
+
+Rows match when the query's words prefix words of the model's
+``search_vector`` (a generated tsvector with a GIN index) or when the query
+is similar to, or a substring of, one of the searched columns (trigram
+indexes). Matches are ranked by ts_rank plus the best trigram similarity
+and paged by keyset on (rank, id), like pagination.paginate.
+"""
+from typing import Any, List, Optional, Sequence, Tuple
+import re
+
+from sqlalchemy import ColumnElement, Select, func, literal, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page, decode_cursor, encode_cursor
+
+# Text search configuration of the search_vector columns
+SEARCH_CONFIG = "simple"
+
+def search_query(
+    model: Any,
+    query: str,
+    columns: Sequence[InstrumentedAttribute],
+    *,
+    cursor: Optional[str] = None
+) -> Optional[Tuple[Select, List[ColumnElement]]]:
+    """Statement selecting (row, rank) for matches of query, and its sort key.
+
+    None for queries without words. The statement is ordered best match
+    first but not limited. Raises pagination.InvalidCursor for cursors that
+    were not issued for the (rank, id) key.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    prefixes = " & ".join(f"{word}:*" for word in words)
+    ts_query = func.to_tsquery(literal(SEARCH_CONFIG).cast(REGCONFIG), prefixes)
+    similarity = func.greatest(*(func.similarity(column, query) for column in columns))
+    rank = (func.ts_rank(model.search_vector, ts_query) + func.coalesce(similarity, 0)).label("rank")
+    keys = [rank, model.id]
+    # Wildcards typed by the user match literally
+    substring = "%" + re.sub(r"([\\%_])", r"\\\1", query) + "%"
+    stmt = select(model, rank).where(or_(
+        model.search_vector.op("@@")(ts_query),
+        *(column.op("%")(query) for column in columns),
+        *(column.ilike(substring, escape="\\") for column in columns)
+    ))
+    if cursor:
+        stmt = stmt.where(tuple_(*keys) < tuple_(*decode_cursor(cursor, keys)))
+    return stmt.order_by(rank.desc(), model.id.desc()), keys
+
+async def search(
+    db: AsyncSession,
+    model: Any,
+    query: str,
+    columns: Sequence[InstrumentedAttribute],
+    *,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> Page:
+    """Run search_query one page at a time; see search_query."""
+    built = search_query(model, query, columns, cursor=cursor)
+    if built is None:
+        return Page([], None)
+    stmt, _ = built
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    # One extra row tells whether another page follows
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = result.all()
+    if len(rows) <= limit:
+        return Page([row[0] for row in rows], None)
+    rows = rows[:limit]
+    return Page([row[0] for row in rows], encode_cursor([rows[-1][1], rows[-1][0].id]))
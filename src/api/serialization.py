@@ -0,0 +1,169 @@
+"""
+Serialization of cached payloads.
+
+Every payload starts with a header byte recording the codec (bits 3-6) and
+the compression (bits 0-2), with the high bit set. JSON text never starts
+with a byte >= 0x80, so payloads without a header are read as the plain
+JSON written by earlier versions.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Optional, Union
+from uuid import UUID
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4 = None
+
+# Codecs
+CODEC_JSON = 1
+CODEC_ORJSON = 2
+CODEC_MSGPACK = 3
+
+# Compression
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+COMPRESSION_LZ4 = 2
+
+# Configuration
+DEFAULT_CODEC = CODEC_ORJSON if orjson is not None else CODEC_JSON
+DEFAULT_COMPRESSION = (
+    COMPRESSION_ZSTD if zstandard is not None
+    else COMPRESSION_LZ4 if lz4 is not None
+    else COMPRESSION_NONE
+)
+COMPRESSION_THRESHOLD = 1024  # bytes; smaller payloads are stored uncompressed
+ZSTD_LEVEL = 3
+
+# msgpack extension types
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_DECIMAL = 3
+
+class SerializationError(ValueError):
+    """Raised when a payload cannot be encoded or decoded."""
+
+def _json_default(value: Any) -> Any:
+    """Encode types the JSON codecs do not handle natively."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+def _msgpack_default(value: Any) -> Any:
+    """Encode datetimes and decimals as msgpack extension types."""
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode())
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(value).encode())
+    return _json_default(value)
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """Decode msgpack extension types."""
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    return msgpack.ExtType(code, data)
+
+def _encode(data: Any, codec: int) -> bytes:
+    if codec == CODEC_ORJSON:
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(data, default=_msgpack_default, use_bin_type=True)
+    return json.dumps(data, default=_json_default, separators=(",", ":")).encode()
+
+def _decode(payload: bytes, codec: int) -> Any:
+    if codec == CODEC_ORJSON:
+        return orjson.loads(payload)
+    if codec == CODEC_MSGPACK:
+        return msgpack.unpackb(payload, ext_hook=_msgpack_ext_hook, raw=False)
+    if codec == CODEC_JSON:
+        return json.loads(payload)
+    raise SerializationError(f"Unknown codec {codec}")
+
+def _compress(payload: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    if compression == COMPRESSION_LZ4:
+        return lz4.frame.compress(payload)
+    return payload
+
+def _decompress(payload: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_ZSTD:
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if compression == COMPRESSION_LZ4:
+        return lz4.frame.decompress(payload)
+    if compression == COMPRESSION_NONE:
+        return payload
+    raise SerializationError(f"Unknown compression {compression}")
+
+def dumps(
+    data: Any,
+    codec: Optional[int] = None,
+    compression: Optional[int] = None,
+    threshold: int = COMPRESSION_THRESHOLD
+) -> bytes:
+    """Serialize data into a headered payload.
+
+    Compression is only applied to payloads larger than ``threshold``.
+    """
+    codec = DEFAULT_CODEC if codec is None else codec
+    compression = DEFAULT_COMPRESSION if compression is None else compression
+    try:
+        payload = _encode(data, codec)
+    except TypeError as e:
+        raise SerializationError(str(e)) from e
+    if len(payload) <= threshold:
+        compression = COMPRESSION_NONE
+    return bytes([0x80 | codec << 3 | compression]) + _compress(payload, compression)
+
+def to_json(data: Any) -> bytes:
+    """Plain JSON without a header, e.g. for HTTP response bodies."""
+    try:
+        return _encode(data, DEFAULT_CODEC)
+    except TypeError as e:
+        raise SerializationError(str(e)) from e
+
+def loads(raw: Union[bytes, str]) -> Any:
+    """Deserialize a payload produced by dumps() or a legacy JSON string."""
+    if isinstance(raw, str) or not raw or raw[0] < 0x80:
+        try:
+            return json.loads(raw)
+        except ValueError as e:
+            raise SerializationError(f"Corrupt cache payload: {e}") from e
+    header = raw[0]
+    codec = (header >> 3) & 0x0F
+    compression = header & 0x07
+    try:
+        return _decode(_decompress(raw[1:], compression), codec)
+    except SerializationError:
+        raise
+    except Exception as e:
+        raise SerializationError(f"Corrupt cache payload: {e}") from e
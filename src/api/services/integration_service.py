@@ -2,9 +2,10 @@
 Integration service for managing external integrations.
 """
 import logging
-from typing import Optional, List, Dict, Type
+from typing import Optional, List, Dict, Sequence, Type
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from src.api.models.integration import (
@@ -21,6 +22,8 @@ from src.api.integrations.providers import (
 )
 from src.api.integrations.clients.base import IntegrationClient
 from src.api.integrations.clients.hubspot import HubSpotClient
+from src.api.fieldsets import select_fields
+from src.api.pagination import Page, paginate
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +36,7 @@ CLIENT_CLASSES = {
 class IntegrationService:
     """Service for managing integrations."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def create_integration(
@@ -69,33 +72,32 @@ class IntegrationService:
 
             # Save to database
             self.db.add(db_integration)
-            self.db.commit()
-            self.db.refresh(db_integration)
+            await self.db.commit()
+            await self.db.refresh(db_integration)
             return db_integration
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError(f"Failed to create integration: {str(e)}")
 
-    def get_integration(self, integration_id: int) -> Optional[Integration]:
+    async def get_integration(self, integration_id: int) -> Optional[Integration]:
         """Get integration by ID."""
-        return self.db.query(Integration).filter(
-            Integration.id == integration_id
-        ).first()
+        return await self.db.get(Integration, integration_id)
 
-    def get_integrations(
+    async def get_integrations(
         self,
         type: Optional[str] = None,
         provider: Optional[str] = None
     ) -> List[Integration]:
         """Get all integrations with optional filtering."""
-        query = self.db.query(Integration)
+        query = select(Integration)
         
         if type:
-            query = query.filter(Integration.type == type)
+            query = query.where(Integration.type == type)
         if provider:
-            query = query.filter(Integration.provider == provider)
+            query = query.where(Integration.provider == provider)
             
-        return query.all()
+        result = await self.db.execute(query)
+        return result.scalars().all()
 
     async def update_integration(
         self,
@@ -103,7 +105,7 @@ class IntegrationService:
         update_data: IntegrationUpdate
     ) -> Optional[Integration]:
         """Update an integration."""
-        integration = self.get_integration(integration_id)
+        integration = await self.get_integration(integration_id)
         if not integration:
             return None
 
@@ -139,30 +141,30 @@ class IntegrationService:
 
             # Save changes
             integration.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(integration)
+            await self.db.commit()
+            await self.db.refresh(integration)
             return integration
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError(f"Failed to update integration: {str(e)}")
 
-    def delete_integration(self, integration_id: int) -> bool:
+    async def delete_integration(self, integration_id: int) -> bool:
         """Delete an integration."""
-        integration = self.get_integration(integration_id)
+        integration = await self.get_integration(integration_id)
         if not integration:
             return False
 
         try:
-            self.db.delete(integration)
-            self.db.commit()
+            await self.db.delete(integration)
+            await self.db.commit()
             return True
         except IntegrityError:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError("Cannot delete integration with existing sync logs")
 
     async def sync_integration(self, integration_id: int) -> IntegrationSyncLog:
         """Sync data with integration."""
-        integration = self.get_integration(integration_id)
+        integration = await self.get_integration(integration_id)
         if not integration:
             raise ValueError("Integration not found")
 
@@ -176,7 +178,7 @@ class IntegrationService:
             started_at=datetime.utcnow()
         )
         self.db.add(sync_log)
-        self.db.commit()
+        await self.db.commit()
 
         try:
             # Initialize client
@@ -210,21 +212,30 @@ class IntegrationService:
             integration.error_message = str(e)
 
         finally:
-            self.db.commit()
-            self.db.refresh(sync_log)
+            await self.db.commit()
+            await self.db.refresh(sync_log)
             return sync_log
 
-    def get_sync_logs(
+    async def get_sync_logs(
         self,
         integration_id: int,
-        limit: int = 100
-    ) -> List[IntegrationSyncLog]:
-        """Get sync logs for an integration."""
-        return self.db.query(IntegrationSyncLog).filter(
-            IntegrationSyncLog.integration_id == integration_id
-        ).order_by(
-            IntegrationSyncLog.started_at.desc()
-        ).limit(limit).all()
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Get a page of sync logs for an integration, newest first.
+
+        With ``fields``, items are column dicts of those fields.
+        """
+        query = select_fields(IntegrationSyncLog, fields, required=("id", "started_at"))
+        return await paginate(
+            self.db,
+            query.where(IntegrationSyncLog.integration_id == integration_id),
+            [IntegrationSyncLog.started_at, IntegrationSyncLog.id],
+            cursor=cursor,
+            limit=limit,
+            rows=bool(fields)
+        )
 
     def _get_client(self, integration: Integration) -> IntegrationClient:
         """Get integration client instance."""
@@ -3,11 +3,14 @@ Notification service for handling different types of notifications.
 """
 import logging
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, Sequence
 from fastapi import BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.models.notification import Notification, NotificationCreate
+from src.api.fieldsets import select_fields
+from src.api.pagination import Page, paginate
 from src.api.services.email_service import send_email
 from src.api.services.push_service import send_push_notification
 
@@ -16,7 +19,7 @@ logger = logging.getLogger(__name__)
 class NotificationService:
     """Service for handling notifications."""
 
-    def __init__(self, db: Session, background_tasks: BackgroundTasks):
+    def __init__(self, db: AsyncSession, background_tasks: BackgroundTasks):
         self.db = db
         self.background_tasks = background_tasks
 
@@ -29,8 +32,8 @@ class NotificationService:
             content=notification.content
         )
         self.db.add(db_notification)
-        self.db.commit()
-        self.db.refresh(db_notification)
+        await self.db.commit()
+        await self.db.refresh(db_notification)
 
         # Send notification based on type
         if notification.type == "email":
@@ -46,43 +49,57 @@ class NotificationService:
 
         return db_notification
 
-    def get_user_notifications(
+    async def get_user_notifications(
         self,
         user_id: int,
         unread_only: bool = False,
-        limit: int = 50
-    ) -> List[Notification]:
-        """Get notifications for a user."""
-        query = self.db.query(Notification).filter(Notification.user_id == user_id)
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Get a page of notifications for a user, newest first.
+
+        With ``fields``, items are column dicts of those fields.
+        """
+        query = select_fields(Notification, fields, required=("id", "created_at"))
+        query = query.where(Notification.user_id == user_id)
         
         if unread_only:
-            query = query.filter(Notification.read == False)
+            query = query.where(Notification.read == False)
         
-        return query.order_by(Notification.created_at.desc()).limit(limit).all()
+        return await paginate(
+            self.db, query, [Notification.created_at, Notification.id],
+            cursor=cursor, limit=limit, rows=bool(fields)
+        )
 
-    def mark_as_read(self, notification_id: int, user_id: int) -> Optional[Notification]:
+    async def mark_as_read(self, notification_id: int, user_id: int) -> Optional[Notification]:
         """Mark a notification as read."""
-        notification = self.db.query(Notification).filter(
-            Notification.id == notification_id,
-            Notification.user_id == user_id
-        ).first()
+        result = await self.db.execute(
+            select(Notification).where(
+                Notification.id == notification_id,
+                Notification.user_id == user_id
+            )
+        )
+        notification = result.scalars().first()
 
         if notification:
             notification.read = True
-            self.db.commit()
-            self.db.refresh(notification)
+            await self.db.commit()
+            await self.db.refresh(notification)
 
         return notification
 
-    def mark_all_as_read(self, user_id: int) -> int:
+    async def mark_all_as_read(self, user_id: int) -> int:
         """Mark all notifications as read for a user."""
-        result = self.db.query(Notification).filter(
-            Notification.user_id == user_id,
-            Notification.read == False
-        ).update({"read": True})
+        result = await self.db.execute(
+            update(Notification).where(
+                Notification.user_id == user_id,
+                Notification.read == False
+            ).values(read=True)
+        )
         
-        self.db.commit()
-        return result
+        await self.db.commit()
+        return result.rowcount
 
     async def _send_email_notification(self, notification: Notification):
         """Send email notification."""
@@ -93,7 +110,7 @@ class NotificationService:
                 recipient_id=notification.user_id
             )
             notification.delivered_at = datetime.utcnow()
-            self.db.commit()
+            await self.db.commit()
         except Exception as e:
             logger.error(f"Failed to send email notification: {str(e)}")
 
@@ -106,19 +123,21 @@ class NotificationService:
                 user_id=notification.user_id
             )
             notification.delivered_at = datetime.utcnow()
-            self.db.commit()
+            await self.db.commit()
         except Exception as e:
             logger.error(f"Failed to send push notification: {str(e)}")
 
-    def cleanup_old_notifications(self, days: int = 30) -> int:
+    async def cleanup_old_notifications(self, days: int = 30) -> int:
         """Clean up notifications older than specified days."""
         from datetime import timedelta
         
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        result = self.db.query(Notification).filter(
-            Notification.created_at < cutoff_date,
-            Notification.read == True
-        ).delete()
+        result = await self.db.execute(
+            delete(Notification).where(
+                Notification.created_at < cutoff_date,
+                Notification.read == True
+            )
+        )
         
-        self.db.commit()
-        return result
\ No newline at end of file
+        await self.db.commit()
+        return result.rowcount
\ No newline at end of file
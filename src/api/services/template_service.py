@@ -7,7 +7,8 @@ import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from jinja2 import Environment, BaseLoader, TemplateError
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from src.api.models.template import (
@@ -22,7 +23,7 @@ logger = logging.getLogger(__name__)
 class TemplateService:
     """Service for handling templates."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.jinja_env = Environment(
             loader=BaseLoader(),
@@ -31,7 +32,7 @@ class TemplateService:
             lstrip_blocks=True
         )
 
-    def create_template(self, template: TemplateCreate, user_id: int) -> Template:
+    async def create_template(self, template: TemplateCreate, user_id: int) -> Template:
         """Create a new template."""
         # Validate template variables
         self._validate_template(template.content, template.variables)
@@ -51,24 +52,24 @@ class TemplateService:
             
             # If this is a default template, unset other defaults
             if template.is_default:
-                self._unset_other_defaults(template.type)
+                await self._unset_other_defaults(template.type)
                 db_template.is_default = True
             
-            self.db.commit()
-            self.db.refresh(db_template)
+            await self.db.commit()
+            await self.db.refresh(db_template)
             return db_template
         except IntegrityError:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError("Error creating template")
 
-    def update_template(
+    async def update_template(
         self,
         template_id: int,
         update_data: TemplateUpdate,
         user_id: int
     ) -> Optional[Template]:
         """Update a template."""
-        template = self.get_template(template_id)
+        template = await self.get_template(template_id)
         if not template:
             return None
 
@@ -88,67 +89,71 @@ class TemplateService:
 
         # Handle default flag
         if update_data.is_default:
-            self._unset_other_defaults(template.type)
+            await self._unset_other_defaults(template.type)
 
         template.updated_at = datetime.utcnow()
 
         try:
-            self.db.commit()
-            self.db.refresh(template)
+            await self.db.commit()
+            await self.db.refresh(template)
             return template
         except IntegrityError:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError("Error updating template")
 
-    def delete_template(self, template_id: int) -> bool:
+    async def delete_template(self, template_id: int) -> bool:
         """Delete a template."""
-        template = self.get_template(template_id)
+        template = await self.get_template(template_id)
         if not template:
             return False
 
         try:
-            self.db.delete(template)
-            self.db.commit()
+            await self.db.delete(template)
+            await self.db.commit()
             return True
         except IntegrityError:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError("Cannot delete template with existing instances")
 
-    def get_template(self, template_id: int) -> Optional[Template]:
+    async def get_template(self, template_id: int) -> Optional[Template]:
         """Get a template by ID."""
-        return self.db.query(Template).filter(Template.id == template_id).first()
+        return await self.db.get(Template, template_id)
 
-    def get_templates(
+    async def get_templates(
         self,
         type: Optional[str] = None,
         active_only: bool = True
     ) -> List[Template]:
         """Get all templates."""
-        query = self.db.query(Template)
+        query = select(Template)
         
         if type:
-            query = query.filter(Template.type == type)
+            query = query.where(Template.type == type)
         if active_only:
-            query = query.filter(Template.is_active == True)
+            query = query.where(Template.is_active == True)
             
-        return query.order_by(Template.name).all()
+        result = await self.db.execute(query.order_by(Template.name))
+        return result.scalars().all()
 
-    def get_default_template(self, type: str) -> Optional[Template]:
+    async def get_default_template(self, type: str) -> Optional[Template]:
         """Get default template for a type."""
-        return self.db.query(Template).filter(
-            Template.type == type,
-            Template.is_default == True,
-            Template.is_active == True
-        ).first()
+        result = await self.db.execute(
+            select(Template).where(
+                Template.type == type,
+                Template.is_default == True,
+                Template.is_active == True
+            )
+        )
+        return result.scalars().first()
 
-    def create_instance(
+    async def create_instance(
         self,
         template_id: int,
         variables: Dict[str, Any],
         user_id: int
     ) -> TemplateInstance:
         """Create a template instance."""
-        template = self.get_template(template_id)
+        template = await self.get_template(template_id)
         if not template:
             raise ValueError("Template not found")
 
@@ -165,11 +170,11 @@ class TemplateService:
 
         try:
             self.db.add(instance)
-            self.db.commit()
-            self.db.refresh(instance)
+            await self.db.commit()
+            await self.db.refresh(instance)
             return instance
         except IntegrityError:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError("Error creating template instance")
 
     def render_template(
@@ -238,9 +243,11 @@ class TemplateService:
                 except:
                     raise ValueError(f"Variable '{var}' must be a valid date (YYYY-MM-DD)")
 
-    def _unset_other_defaults(self, type: str):
+    async def _unset_other_defaults(self, type: str):
         """Unset default flag for other templates of same type."""
-        self.db.query(Template).filter(
-            Template.type == type,
-            Template.is_default == True
-        ).update({"is_default": False})
\ No newline at end of file
+        await self.db.execute(
+            update(Template).where(
+                Template.type == type,
+                Template.is_default == True
+            ).values(is_default=False)
+        )
\ No newline at end of file
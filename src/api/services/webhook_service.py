@@ -7,8 +7,9 @@ import hmac
 import hashlib
 import asyncio
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from typing import List, Optional, Dict, Any, Sequence
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 import httpx
 
@@ -17,19 +18,24 @@ from src.api.models.webhook import (
     WebhookCreate,
     WebhookUpdate,
     WebhookDelivery,
-    WebhookEvent
+    WebhookEvent,
+    WebhookSubscription
 )
+from src.api.fieldsets import select_fields
+from src.api.pagination import Page, paginate
 
 logger = logging.getLogger(__name__)
 
 class WebhookService:
     """Service for managing webhooks."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self._http_client = httpx.AsyncClient(timeout=30.0)
+        # Deliveries run concurrently but share one session
+        self._commit_lock = asyncio.Lock()
 
-    def create_webhook(self, webhook: WebhookCreate, user_id: int) -> Webhook:
+    async def create_webhook(self, webhook: WebhookCreate, user_id: int) -> Webhook:
         """Create a new webhook."""
         db_webhook = Webhook(
             name=webhook.name,
@@ -44,41 +50,46 @@ class WebhookService:
 
         try:
             self.db.add(db_webhook)
-            self.db.commit()
-            self.db.refresh(db_webhook)
+            await self.db.flush()
+            await self._set_subscriptions(db_webhook.id, webhook.events)
+            await self.db.commit()
+            await self.db.refresh(db_webhook)
             return db_webhook
         except IntegrityError:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError("Error creating webhook")
 
-    def get_webhook(self, webhook_id: int) -> Optional[Webhook]:
+    async def get_webhook(self, webhook_id: int) -> Optional[Webhook]:
         """Get webhook by ID."""
-        return self.db.query(Webhook).filter(Webhook.id == webhook_id).first()
+        return await self.db.get(Webhook, webhook_id)
 
-    def get_webhooks(
+    async def get_webhooks(
         self,
         event_type: Optional[str] = None,
         active_only: bool = True
     ) -> List[Webhook]:
         """Get all webhooks."""
-        query = self.db.query(Webhook)
+        query = select(Webhook)
         
         if active_only:
-            query = query.filter(Webhook.is_active == True)
+            query = query.where(Webhook.is_active == True)
         
         if event_type:
             # Filter webhooks that subscribe to this event
-            query = query.filter(Webhook.events.contains([event_type]))
+            query = query.join(
+                WebhookSubscription, WebhookSubscription.webhook_id == Webhook.id
+            ).where(WebhookSubscription.event_type == event_type)
             
-        return query.all()
+        result = await self.db.execute(query)
+        return result.scalars().all()
 
-    def update_webhook(
+    async def update_webhook(
         self,
         webhook_id: int,
         webhook_update: WebhookUpdate
     ) -> Optional[Webhook]:
         """Update a webhook."""
-        webhook = self.get_webhook(webhook_id)
+        webhook = await self.get_webhook(webhook_id)
         if not webhook:
             return None
 
@@ -91,31 +102,44 @@ class WebhookService:
 
         try:
             webhook.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(webhook)
+            if "events" in update_dict:
+                await self._set_subscriptions(webhook.id, update_dict["events"])
+            await self.db.commit()
+            await self.db.refresh(webhook)
             return webhook
         except IntegrityError:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError("Error updating webhook")
 
-    def delete_webhook(self, webhook_id: int) -> bool:
+    async def delete_webhook(self, webhook_id: int) -> bool:
         """Delete a webhook."""
-        webhook = self.get_webhook(webhook_id)
+        webhook = await self.get_webhook(webhook_id)
         if not webhook:
             return False
 
         try:
-            self.db.delete(webhook)
-            self.db.commit()
+            await self.db.delete(webhook)
+            await self.db.commit()
             return True
         except IntegrityError:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError("Cannot delete webhook with existing deliveries")
 
+    async def _set_subscriptions(self, webhook_id: int, events: List[str]) -> None:
+        """Replace the subscription rows of a webhook."""
+        await self.db.execute(
+            delete(WebhookSubscription).where(WebhookSubscription.webhook_id == webhook_id)
+        )
+        if events:
+            await self.db.execute(
+                insert(WebhookSubscription),
+                [{"event_type": event_type, "webhook_id": webhook_id} for event_type in set(events)]
+            )
+
     async def trigger_event(self, event: WebhookEvent) -> List[WebhookDelivery]:
         """Trigger webhook event."""
         # Get active webhooks for this event
-        webhooks = self.get_webhooks(event.event_type)
+        webhooks = await self.get_webhooks(event.event_type)
         if not webhooks:
             return []
 
@@ -129,7 +153,7 @@ class WebhookService:
             )
             self.db.add(delivery)
             deliveries.append(delivery)
-        self.db.commit()
+        await self.db.commit()
 
         # Deliver webhooks asynchronously
         delivery_tasks = [
@@ -140,25 +164,35 @@ class WebhookService:
 
         return deliveries
 
-    def get_deliveries(
+    async def get_deliveries(
         self,
         webhook_id: int,
-        limit: int = 100
-    ) -> List[WebhookDelivery]:
-        """Get webhook delivery history."""
-        return self.db.query(WebhookDelivery).filter(
-            WebhookDelivery.webhook_id == webhook_id
-        ).order_by(
-            WebhookDelivery.created_at.desc()
-        ).limit(limit).all()
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Get a page of webhook delivery history, newest first.
+
+        With ``fields``, items are column dicts of those fields, which
+        keeps payloads and response bodies out of list views.
+        """
+        query = select_fields(WebhookDelivery, fields, required=("id", "created_at"))
+        return await paginate(
+            self.db,
+            query.where(WebhookDelivery.webhook_id == webhook_id),
+            [WebhookDelivery.created_at, WebhookDelivery.id],
+            cursor=cursor,
+            limit=limit,
+            rows=bool(fields)
+        )
 
     async def retry_delivery(self, delivery_id: int) -> Optional[WebhookDelivery]:
         """Retry a failed webhook delivery."""
-        delivery = self.db.query(WebhookDelivery).get(delivery_id)
+        delivery = await self.db.get(WebhookDelivery, delivery_id)
         if not delivery or delivery.is_success:
             return None
 
-        webhook = self.get_webhook(delivery.webhook_id)
+        webhook = await self.get_webhook(delivery.webhook_id)
         if not webhook or not webhook.is_active:
             return None
 
@@ -168,7 +202,7 @@ class WebhookService:
         delivery.response_body = None
         delivery.error_message = None
         delivery.completed_at = None
-        self.db.commit()
+        await self.db.commit()
 
         # Attempt delivery
         await self._deliver_webhook(webhook, delivery)
@@ -234,7 +268,8 @@ class WebhookService:
                     await asyncio.sleep(2 ** attempt)
             
             finally:
-                self.db.commit()
+                async with self._commit_lock:
+                    await self.db.commit()
 
     def _generate_signature(self, secret: str, payload: Dict[str, Any]) -> str:
         """Generate HMAC signature for webhook payload."""
@@ -0,0 +1,87 @@
+"""
+Shared fixtures.
+"""
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Mapping, Optional, Sequence
+
+import pytest
+from sqlalchemy import MetaData, Table, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.api import cache
+from src.api.cache import LocalCache
+from src.api.cache_backends import MemoryBackend
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked postgres unless TEST_DATABASE_URL is set."""
+    if os.getenv("TEST_DATABASE_URL"):
+        return
+    skip = pytest.mark.skip(reason="TEST_DATABASE_URL is not set")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
+
+@pytest.fixture
+def memory_backend(monkeypatch):
+    """Run the cache against a fresh in-memory backend and local tier."""
+    backend = MemoryBackend()
+    monkeypatch.setattr(cache, "backend", backend)
+    monkeypatch.setattr(cache, "local_cache", LocalCache())
+    return backend
+
+@pytest.fixture
+def run_with_db():
+    """Run a coroutine against a fresh in-memory aiosqlite database.
+
+    ``run(test, metadata, seed)`` creates the tables of ``metadata``, inserts
+    ``seed`` ({table: rows}, in order) and awaits ``test(db)`` with a session.
+    Statements executed after seeding are collected on ``db.statements``.
+
+    With ``savepoints=True`` SQLAlchemy, not the driver, emits BEGIN so
+    SAVEPOINTs work. With ``sessions=True`` the test receives the session
+    factory instead, with the statements on ``factory.statements``.
+    """
+    def run(
+        test: Callable[[Any], Awaitable[None]],
+        metadata: MetaData,
+        seed: Optional[Mapping[Table, Sequence[Mapping[str, Any]]]] = None,
+        *,
+        savepoints: bool = False,
+        sessions: bool = False
+    ) -> None:
+        async def main():
+            engine = create_async_engine("sqlite+aiosqlite://")
+            if savepoints:
+                @event.listens_for(engine.sync_engine, "connect")
+                def connect(dbapi_connection, connection_record):
+                    dbapi_connection.isolation_level = None
+
+                @event.listens_for(engine.sync_engine, "begin")
+                def begin(conn):
+                    conn.exec_driver_sql("BEGIN")
+
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(metadata.create_all)
+                    for table, rows in (seed or {}).items():
+                        await conn.execute(table.insert(), rows)
+                statements = []
+                event.listen(
+                    engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+                )
+                factory = async_sessionmaker(engine, expire_on_commit=False)
+                if sessions:
+                    factory.statements = statements
+                    await test(factory)
+                else:
+                    async with factory() as db:
+                        db.statements = statements
+                        await test(db)
+            finally:
+                # In-memory aiosqlite connections keep the loop alive until disposed
+                await engine.dispose()
+
+        asyncio.run(main())
+
+    return run
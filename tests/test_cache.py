@@ -0,0 +1,395 @@
+"""
+Tests for cache utilities.
+"""
+import asyncio
+import inspect
+import json
+import socket
+import time
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import redis
+import redis.asyncio
+from fastapi import Depends, FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from src.api import cache, serialization
+from src.api.cache_backends import MemoryBackend, RedisBackend
+from src.api.database import LazySession
+from src.api.main import app
+from src.api.cache import (
+    LocalCache,
+    LocalRateLimiter,
+    _handle_invalidation,
+    build_cache_key,
+    cache_response,
+    get_many_or_load,
+    invalidate_tags,
+    local_cache,
+    rate_limit
+)
+
+def test_local_cache_get_set():
+    """Test storing and reading a value."""
+    cache = LocalCache(max_size=10, ttl=60)
+    cache.set("a", "1")
+    assert cache.get("a") == "1"
+    assert cache.get("missing") is None
+
+def test_local_cache_lru_eviction():
+    """Test least recently used entries are evicted first."""
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+
+def test_local_cache_ttl():
+    """Test entries expire after their TTL."""
+    cache = LocalCache(max_size=10, ttl=60)
+    cache.set("a", "1", expire=1)
+    cache._data["a"] = ("1", time.monotonic() - 1)
+    assert cache.get("a") is None
+
+def test_local_cache_delete_pattern():
+    """Test pattern deletion only drops matching keys."""
+    cache = LocalCache(max_size=10, ttl=60)
+    cache.set("mcp:deals:1", "1")
+    cache.set("mcp:deals:2", "2")
+    cache.set("mcp:clients:1", "3")
+    cache.delete_pattern("mcp:deals:*")
+    assert cache.get("mcp:deals:1") is None
+    assert cache.get("mcp:clients:1") == "3"
+
+def test_invalidation_message_drops_local_key():
+    """Test pub/sub invalidation messages clear the local tier."""
+    local_cache.set("mcp:test", "value")
+    _handle_invalidation('{"key": "mcp:test"}')
+    assert local_cache.get("mcp:test") is None
+
+def test_build_cache_key_is_deterministic():
+    """Test parameter order does not change the key."""
+    first = build_cache_key("get_deals", {"status": "new", "owner": 1})
+    second = build_cache_key("get_deals", {"owner": 1, "status": "new"})
+    assert first == second == "mcp:v1:get_deals:owner=1&status=new"
+
+def test_build_cache_key_hashes_long_params():
+    """Test long parameter strings are hashed to a fixed length."""
+    key = build_cache_key("search", {"query": "x" * 500})
+    assert key.startswith("mcp:v1:search:")
+    assert len(key) == len("mcp:v1:search:") + 64
+
+def test_build_cache_key_version_prefix():
+    """Test the version is part of the key."""
+    assert build_cache_key("stats", version="v2") == "mcp:v2:stats"
+
+def test_cache_response_coalesces_concurrent_misses(memory_backend):
+    """Test concurrent misses for one key compute the response once."""
+    calls = []
+
+    @cache_response(expire=60)
+    async def get_stats(period: str = "day"):
+        calls.append(period)
+        await asyncio.sleep(0.01)
+        return {"period": period}
+
+    async def run():
+        return await asyncio.gather(*(get_stats(period="day") for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert calls == ["day"]
+    assert all(result == {"period": "day"} for result in results)
+
+def test_cache_response_serves_stale_while_revalidating(memory_backend):
+    """Test an expired entry is served while one background refresh runs."""
+    key = build_cache_key("get_stats", {})
+    entry = {"value": "old", "fresh_until": time.time() - 1, "delta": 0}
+    asyncio.run(memory_backend.set(key, json.dumps(entry).encode(), 90))
+    calls = []
+
+    @cache_response(expire=60, stale_ttl=30)
+    async def get_stats():
+        calls.append(1)
+        return "new"
+
+    async def run():
+        first = await get_stats()
+        second = await get_stats()
+        await asyncio.sleep(0)
+        return first, second
+
+    assert asyncio.run(run()) == ("old", "old")
+    assert len(calls) == 1
+    assert serialization.loads(asyncio.run(memory_backend.get(key)))["value"] == "new"
+
+def test_stale_refresh_uses_its_own_session(memory_backend):
+    """Test a background refresh after the request finished opens and closes its own session."""
+    sessions = []
+
+    class Session:
+        def __init__(self):
+            self.closed = False
+            sessions.append(self)
+
+        async def count(self):
+            if self.closed:
+                raise RuntimeError("session is closed")
+            return len(sessions)
+
+        async def close(self):
+            self.closed = True
+
+    async def get_db():
+        db = LazySession(Session)
+        try:
+            yield db
+        finally:
+            if db.session_started:
+                await db.close()
+
+    stats_app = FastAPI()
+
+    @stats_app.get("/stats")
+    @cache_response(expire=60, stale_ttl=30)
+    async def get_stats(response: Response, db=Depends(get_db)):
+        # Let the request finish before the refresh touches the session
+        await asyncio.sleep(0.05)
+        response.headers["X-Refreshed"] = "1"
+        return {"sessions": await db.count()}
+
+    key = build_cache_key("get_stats", {})
+    entry = {"value": {"sessions": 0}, "fresh_until": time.time() - 1, "delta": 0}
+    asyncio.run(memory_backend.set(key, json.dumps(entry).encode(), 90))
+
+    with TestClient(stats_app) as client:
+        response = client.get("/stats")
+        assert response.json() == {"sessions": 0}
+        assert "X-Refreshed" not in response.headers
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            stored = serialization.loads(asyncio.run(memory_backend.get(key)))
+            if stored["value"] != {"sessions": 0}:
+                break
+            time.sleep(0.01)
+
+    assert stored["value"] == {"sessions": 1}
+    assert len(sessions) == 1 and sessions[0].closed
+
+def test_cache_response_waiter_sees_fresh_entry_behind_stale_local_copy(memory_backend):
+    """Test a waiting worker picks up another worker's result despite its local copy."""
+    key = build_cache_key("get_stats", {})
+    stale = serialization.dumps({"value": "old", "fresh_until": time.time() - 1, "delta": 0})
+    calls = []
+
+    @cache_response(expire=60, lock_timeout=5)
+    async def get_stats():
+        calls.append(1)
+        return "mine"
+
+    async def other_worker():
+        await asyncio.sleep(0.2)
+        fresh = {"value": "new", "fresh_until": time.time() + 60, "delta": 0}
+        await memory_backend.set(key, serialization.dumps(fresh), 60)
+
+    async def run():
+        await memory_backend.set(key, stale, 60)
+        await memory_backend.set(key + ":lock", b"other", 5)
+        cache.local_cache.set(key, stale)
+        writer = asyncio.create_task(other_worker())
+        started = time.monotonic()
+        result = await get_stats()
+        await writer
+        return result, time.monotonic() - started
+
+    result, elapsed = asyncio.run(run())
+    assert result == "new"
+    assert elapsed < 1
+    assert calls == []
+
+def test_cache_response_skips_injected_objects(memory_backend):
+    """Test keys ignore dependency-injected objects and use key_params."""
+    calls = []
+
+    class User:
+        id = 7
+
+    @cache_response(expire=60, key_params=["current_user.id"])
+    async def get_dashboard(current_user=None, db=None):
+        calls.append(1)
+        return {"ok": True}
+
+    asyncio.run(get_dashboard(current_user=User(), db=object()))
+    asyncio.run(get_dashboard(current_user=User(), db=object()))
+    assert list(memory_backend.keys()) == ["mcp:v1:get_dashboard:current_user.id=7"]
+    assert len(calls) == 1
+
+def test_local_rate_limiter_allows_burst_then_blocks():
+    """Test the fallback limiter enforces the bucket size."""
+    limiter = LocalRateLimiter()
+    results = [limiter.consume("user:1", limit=3, window=60) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[2].remaining == 0
+    assert results[3].headers()["Retry-After"] == "20"
+
+def test_local_rate_limiter_keys_are_independent():
+    """Test each principal has its own bucket."""
+    limiter = LocalRateLimiter()
+    assert limiter.consume("user:1", limit=1, window=60).allowed
+    assert not limiter.consume("user:1", limit=1, window=60).allowed
+    assert limiter.consume("user:2", limit=1, window=60).allowed
+
+def test_rate_limit_exposes_request_params_to_fastapi():
+    """Test the decorated endpoint asks FastAPI for the request and response."""
+    @rate_limit("stats")
+    async def get_stats(current_user=None):
+        return {}
+
+    params = inspect.signature(get_stats).parameters
+    assert params["rate_limit_request"].annotation is Request
+    assert params["rate_limit_response"].annotation is Response
+    assert "current_user" in params
+
+def test_cache_response_records_formatted_tags(memory_backend):
+    """Test tags are formatted from the call arguments and invalidate entries."""
+
+    class User:
+        id = 7
+
+    @cache_response(expire=60, key_params=["current_user.id"], tags=["deals", "user:{current_user.id}"])
+    async def get_dashboard(current_user=None):
+        return {}
+
+    asyncio.run(get_dashboard(current_user=User()))
+    key = "mcp:v1:get_dashboard:current_user.id=7"
+    assert sorted(memory_backend.keys()) == ["mcp:tag:deals", "mcp:tag:user:7", key]
+
+    assert asyncio.run(invalidate_tags("user:7")) == 1
+    assert list(memory_backend.keys()) == ["mcp:tag:deals"]
+    assert cache.local_cache.get(key) is None
+
+def test_serialization_round_trips_datetime_and_decimal():
+    """Test every available codec handles datetimes and decimals."""
+    data = {"created_at": datetime(2024, 1, 2, 3, 4, 5), "value": Decimal("10.50")}
+    codecs = [serialization.CODEC_JSON]
+    if serialization.orjson is not None:
+        codecs.append(serialization.CODEC_ORJSON)
+    for codec in codecs:
+        assert serialization.loads(serialization.dumps(data, codec=codec)) == {
+            "created_at": "2024-01-02T03:04:05",
+            "value": "10.50"
+        }
+    if serialization.msgpack is not None:
+        payload = serialization.dumps(data, codec=serialization.CODEC_MSGPACK)
+        assert serialization.loads(payload) == data
+
+def test_serialization_compresses_large_payloads_only():
+    """Test the compression threshold and header byte."""
+    small = serialization.dumps({"a": 1}, codec=serialization.CODEC_JSON)
+    assert small[0] & 0x07 == serialization.COMPRESSION_NONE
+    if serialization.DEFAULT_COMPRESSION != serialization.COMPRESSION_NONE:
+        large = serialization.dumps(["x" * 100] * 100, codec=serialization.CODEC_JSON)
+        assert large[0] & 0x07 == serialization.DEFAULT_COMPRESSION
+        assert len(large) < 1000
+        assert serialization.loads(large) == ["x" * 100] * 100
+
+def test_serialization_reads_legacy_json():
+    """Test entries written as plain JSON are still readable."""
+    assert serialization.loads('{"a": 1}') == {"a": 1}
+    assert serialization.loads(b'[1, 2]') == [1, 2]
+
+def test_unreadable_legacy_payloads_are_skipped(memory_backend):
+    """Test non-JSON payloads raise SerializationError and are skipped by get_many."""
+    with pytest.raises(serialization.SerializationError):
+        serialization.loads(b"not json")
+    asyncio.run(memory_backend.set("mcp:bad", b"not json", 60))
+    asyncio.run(memory_backend.set("mcp:good", serialization.dumps(1), 60))
+    assert asyncio.run(cache.get_many(["mcp:bad", "mcp:good"])) == {"mcp:good": 1}
+
+def test_get_many_or_load_batches_misses(memory_backend):
+    """Test only missing keys are passed to the loader, in one call."""
+    asyncio.run(memory_backend.set("mcp:deal:1", serialization.dumps({"id": 1}), 60))
+    loads_requested = []
+
+    async def loader(keys):
+        loads_requested.append(keys)
+        return {key: {"id": int(key.rsplit(":", 1)[1])} for key in keys}
+
+    keys = ["mcp:deal:1", "mcp:deal:2", "mcp:deal:3"]
+    result = asyncio.run(get_many_or_load(keys, loader))
+    assert result == {key: {"id": i} for i, key in enumerate(keys, start=1)}
+    assert loads_requested == [["mcp:deal:2", "mcp:deal:3"]]
+    assert sorted(memory_backend.keys()) == keys
+
+def test_memory_backend_ttl_incr_and_scan():
+    """Test the in-memory backend follows Redis semantics."""
+    backend = MemoryBackend()
+
+    async def run():
+        assert await backend.incr("mcp:count", expire=60) == 1
+        assert await backend.incr("mcp:count") == 2
+        await backend.set("mcp:deal:1", b"1", 60)
+        await backend.set("mcp:deal:2", b"2", 60)
+        await backend.set("mcp:gone", b"x", 60)
+        backend._data["mcp:gone"] = (b"x", time.monotonic() - 1)
+        assert await backend.get("mcp:gone") is None
+        assert sorted([key async for key in backend.scan("mcp:deal:*")]) == ["mcp:deal:1", "mcp:deal:2"]
+        await backend.delete_pattern("mcp:deal:*")
+        assert list(backend.keys()) == ["mcp:count"]
+
+    asyncio.run(run())
+
+def test_redis_backend_waits_for_a_free_connection():
+    """Test a busy Redis pool makes callers wait instead of failing at once."""
+    backend = RedisBackend(max_connections=1, pool_timeout=0.05)
+    assert isinstance(backend.pool, redis.asyncio.BlockingConnectionPool)
+    assert backend.pool.max_connections == 1
+
+    async def run():
+        taken = await backend.pool._take_connection()
+        started = time.monotonic()
+        with pytest.raises(redis.ConnectionError, match="No connection available"):
+            await backend.pool.get_connection("GET")
+        assert time.monotonic() - started >= 0.05
+        await backend.pool.release(taken)
+
+    asyncio.run(run())
+
+def test_redis_backend_fails_fast_when_redis_is_down():
+    """Test calls against an unreachable server fail within the connect timeout, not the pool timeout."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    backend = RedisBackend(port=port, max_connections=1, pool_timeout=5)
+
+    async def run():
+        for _ in range(3):
+            started = time.monotonic()
+            with pytest.raises(redis.RedisError):
+                await backend.get("mcp:deal:1")
+            assert time.monotonic() - started < 0.5
+
+    asyncio.run(run())
+
+def test_memory_backend_pubsub_invalidates_local_cache(memory_backend):
+    """Test invalidations published by one worker reach the listener."""
+    async def run():
+        cache.start_invalidation_listener()
+        await asyncio.sleep(0)
+        cache.local_cache.set("mcp:v1:stats", b"cached")
+        await cache.apublish_invalidation("key", "mcp:v1:stats")
+        await asyncio.sleep(0.01)
+        assert cache.local_cache.get("mcp:v1:stats") is None
+        await cache.close_cache()
+
+    asyncio.run(run())
+
+def test_app_runs_invalidation_listener(memory_backend):
+    """Test the app subscribes to invalidations on startup and stops on shutdown."""
+    with TestClient(app):
+        assert cache._invalidation_task is not None
+    assert cache._invalidation_task is None
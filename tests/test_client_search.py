@@ -0,0 +1,188 @@
+"""
+Tests for ranked client search (src.api.search, behind CRUDClient.search).
+
+Statements are checked as compiled for PostgreSQL (asyncpg). Tests marked
+``postgres`` also run them against TEST_DATABASE_URL
+(postgresql+asyncpg://...) and are skipped without it.
+"""
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import Column, Computed, Integer, String, insert, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base
+
+from src.api.pagination import InvalidCursor, decode_cursor, encode_cursor
+from src.api.search import search, search_query
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+TestBase = declarative_base()
+
+class Client(TestBase):
+    """Searchable model shaped like clients."""
+    __tablename__ = "search_clients"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    company = Column(String)
+    search_vector = Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(company, '')), 'B')",
+        persisted=True
+    ))
+
+COLUMNS = [Client.name, Client.company]
+
+class RecordingSession:
+    """Session stand-in that records statements and returns canned (row, rank) rows."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return self
+
+    def all(self):
+        return self.rows
+
+def compiled(stmt):
+    return str(stmt.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}))
+
+def test_query_matches_vector_and_trigrams():
+    """Test prefixes match the tsvector and the query is trigram and substring matched per column."""
+    stmt, _ = search_query(Client, "acme lab", COLUMNS)
+    sql = compiled(stmt)
+    assert "to_tsquery(CAST('simple' AS REGCONFIG), 'acme:* & lab:*')" in sql
+    assert "search_clients.search_vector @@ to_tsquery" in sql
+    assert "(search_clients.name % 'acme lab')" in sql
+    assert "(search_clients.company % 'acme lab')" in sql
+    assert "search_clients.name ILIKE '%acme lab%'" in sql
+    assert "search_clients.company ILIKE '%acme lab%'" in sql
+
+def test_substring_match_escapes_wildcards():
+    """Test %, _ and \\ in the query match literally in the substring fallback."""
+    stmt, _ = search_query(Client, "50% off a_b\\c", COLUMNS)
+    sql = stmt.compile(dialect=asyncpg.dialect())
+    assert str(sql).count("::VARCHAR ESCAPE '") == 2
+    assert "%50\\% off a\\_b\\\\c%" in sql.params.values()
+    assert "50% off a_b\\c" in sql.params.values()
+
+def test_query_ranks_by_text_rank_and_similarity():
+    """Test rows are ordered by ts_rank plus the best similarity, then id."""
+    stmt, keys = search_query(Client, "acme", COLUMNS)
+    sql = compiled(stmt)
+    assert "ts_rank(search_clients.search_vector, to_tsquery(" in sql
+    assert (
+        "coalesce(greatest(similarity(search_clients.name, 'acme'), "
+        "similarity(search_clients.company, 'acme')), 0) AS rank"
+    ) in sql
+    assert sql.endswith("ORDER BY rank DESC, search_clients.id DESC")
+    assert [key.key for key in keys] == ["rank", "id"]
+
+def test_cursor_bounds_rank_and_id():
+    """Test a cursor selects rows strictly after its (rank, id) in rank order."""
+    stmt, _ = search_query(Client, "acme", COLUMNS, cursor=encode_cursor([0.6079271, 42]))
+    sql = compiled(stmt)
+    assert "(ts_rank(" in sql
+    assert ", search_clients.id) < (0.6079271, 42)" in sql
+    assert "search_clients.id) < (" not in compiled(search_query(Client, "acme", COLUMNS)[0])
+
+def test_cursor_round_trips_rank_and_id():
+    """Test a (rank, id) cursor decodes to the exact rank and id."""
+    _, keys = search_query(Client, "acme", COLUMNS)
+    assert decode_cursor(encode_cursor([0.6079271, 42]), keys) == [0.6079271, 42]
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor([42]), keys)
+
+def test_empty_query_returns_empty_page_without_querying():
+    """Test queries without words return an empty page without querying."""
+    db = RecordingSession()
+    for query in ("", "   ", "%-*"):
+        page = asyncio.run(search(db, Client, query, COLUMNS))
+        assert page.items == [] and page.next_cursor is None
+    assert db.statements == []
+
+def test_invalid_cursor_is_rejected_before_querying():
+    """Test malformed cursors and cursors of another sort key raise InvalidCursor."""
+    db = RecordingSession()
+    for cursor in ("not-a-cursor", encode_cursor([42])):
+        with pytest.raises(InvalidCursor):
+            asyncio.run(search(db, Client, "acme", COLUMNS, cursor=cursor))
+    assert db.statements == []
+
+def test_next_cursor_is_the_last_rank_and_id():
+    """Test one extra row is fetched and the cursor names the last returned row."""
+    rows = [(Client(id=id, name=f"Acme {id}"), rank) for id, rank in [(7, 0.9), (3, 0.5), (9, 0.5)]]
+
+    db = RecordingSession(rows)
+    page = asyncio.run(search(db, Client, "acme", COLUMNS, limit=2))
+    assert [client.id for client in page.items] == [7, 3]
+    assert decode_cursor(page.next_cursor, search_query(Client, "acme", COLUMNS)[1]) == [0.5, 3]
+    assert compiled(db.statements[0]).endswith("LIMIT 3")
+
+    page = asyncio.run(search(RecordingSession(rows), Client, "acme", COLUMNS, limit=3))
+    assert len(page.items) == 3 and page.next_cursor is None
+
+CLIENTS = [
+    {"name": "Ana Souza", "company": "Acme Corp"},
+    {"name": "Bruno Lima", "company": "Acme Labs"},
+    {"name": "Carla Dias", "company": "Acme"},
+    {"name": "Acme Supplies", "company": "Globex"},
+    {"name": "Diego Alves", "company": "Initech"},
+]
+
+def _run_with_postgres(test):
+    async def main():
+        engine = create_async_engine(TEST_DATABASE_URL)
+        try:
+            async with engine.connect() as conn:
+                # Everything the test creates and writes is rolled back
+                trans = await conn.begin()
+                try:
+                    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                    await conn.run_sync(TestBase.metadata.create_all)
+                    db = AsyncSession(bind=conn, expire_on_commit=False)
+                    await db.execute(insert(Client), CLIENTS)
+                    await test(db)
+                finally:
+                    await trans.rollback()
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+@pytest.mark.postgres
+def test_search_matches_prefixes_and_substrings():
+    """Test word prefixes and substrings of name or company match."""
+    async def test(db):
+        page = await search(db, Client, "acm", COLUMNS)
+        assert {client.name for client in page.items} == {
+            "Ana Souza", "Bruno Lima", "Carla Dias", "Acme Supplies"
+        }
+        assert page.next_cursor is None
+        assert [client.name for client in (await search(db, Client, "nitec", COLUMNS)).items] == ["Diego Alves"]
+        assert (await search(db, Client, "zzzz", COLUMNS)).items == []
+
+    _run_with_postgres(test)
+
+@pytest.mark.postgres
+def test_search_pages_by_cursor():
+    """Test pages chain by cursor, best matches first, without repeats or gaps."""
+    async def test(db):
+        everything = (await search(db, Client, "acme", COLUMNS)).items
+        seen, cursor = [], None
+        while True:
+            page = await search(db, Client, "acme", COLUMNS, limit=1, cursor=cursor)
+            seen.extend(client.id for client in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert seen == [client.id for client in everything]
+        assert len(seen) == 4
+
+    _run_with_postgres(test)
@@ -0,0 +1,61 @@
+"""
+Tests for the CRUDBase aggregate helpers.
+"""
+from sqlalchemy import Column, Float, Integer, String
+from sqlalchemy.orm import declarative_base
+
+from src.api.crud.base import CRUDBase
+
+TestBase = declarative_base()
+
+class Sale(TestBase):
+    """Row with a grouping column and a value."""
+    __tablename__ = "sales"
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer)
+    status = Column(String)
+    value = Column(Float)
+
+SALES = [
+    {"owner_id": 1, "status": "new", "value": 10.0},
+    {"owner_id": 1, "status": "new", "value": 5.0},
+    {"owner_id": 1, "status": "won", "value": 100.0},
+    {"owner_id": 2, "status": "new", "value": 1.0},
+    {"owner_id": 2, "status": "lost", "value": None},
+]
+
+def test_count(run_with_db):
+    """Test count runs one COUNT query, with and without filters."""
+    crud = CRUDBase(Sale)
+
+    async def test(db):
+        assert await crud.count(db) == 5
+        assert await crud.count(db, filters={"owner_id": 1, "status": "new"}) == 2
+        assert await crud.count(db, filters={"status": "missing"}) == 0
+        assert len(db.statements) == 3
+        assert all("count(*)" in statement for statement in db.statements)
+
+    run_with_db(test, TestBase.metadata, {Sale.__table__: SALES})
+
+def test_count_by(run_with_db):
+    """Test counts are grouped in SQL."""
+    crud = CRUDBase(Sale)
+
+    async def test(db):
+        assert await crud.count_by(db, "status") == {"new": 3, "won": 1, "lost": 1}
+        assert await crud.count_by(db, "status", filters={"owner_id": 2}) == {"new": 1, "lost": 1}
+        assert all("GROUP BY sales.status" in statement for statement in db.statements)
+
+    run_with_db(test, TestBase.metadata, {Sale.__table__: SALES})
+
+def test_sum_by(run_with_db):
+    """Test sums are grouped in SQL, with None for groups without values."""
+    crud = CRUDBase(Sale)
+
+    async def test(db):
+        assert await crud.sum_by(db, "status", "value") == {"new": 16.0, "won": 100.0, "lost": None}
+        assert await crud.sum_by(db, "owner_id", "value", filters={"status": "new"}) == {1: 15.0, 2: 1.0}
+        assert len(db.statements) == 2
+
+    run_with_db(test, TestBase.metadata, {Sale.__table__: SALES})
@@ -0,0 +1,188 @@
+"""
+Tests for the CRUDBase bulk write operations.
+"""
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Column, Integer, String, select
+from sqlalchemy.orm import declarative_base
+
+from src.api.cache import get_cached_data, set_cached_data
+from src.api.crud import base
+from src.api.crud.base import CRUDBase
+from src.api.serialization import loads
+
+TestBase = declarative_base()
+
+class Contact(TestBase):
+    """Model with a unique natural key."""
+    __tablename__ = "contacts"
+
+    id = Column(Integer, primary_key=True)
+    email = Column(String, unique=True, nullable=False)
+    name = Column(String, nullable=False)
+
+class ContactCreate(BaseModel):
+    email: str
+    name: str
+
+class ContactWithId(ContactCreate):
+    id: int
+
+class ContactUpdate(BaseModel):
+    email: str = None
+    name: str = None
+
+pytestmark = pytest.mark.usefixtures("memory_backend")
+
+def _contacts(count, start=0):
+    return [ContactCreate(email=f"c{i}@example.com", name=f"Contact {i}") for i in range(start, start + count)]
+
+async def _emails(db):
+    return (await db.execute(select(Contact.email).order_by(Contact.id))).scalars().all()
+
+def test_create_many_batches_inserts(run_with_db):
+    """Test rows are inserted a batch per statement and returned with their ids."""
+    crud = CRUDBase(Contact)
+
+    async def test(db):
+        result = await crud.create_many(db, objs_in=_contacts(25), batch_size=10)
+        assert result.errors == []
+        assert sorted(contact.id for contact in result.items) == list(range(1, 26))
+        assert await _emails(db) == [f"c{i}@example.com" for i in range(25)]
+        assert len([s for s in db.statements if s.startswith("INSERT")]) == 3
+
+    run_with_db(test, TestBase.metadata, savepoints=True)
+
+def test_create_many_reports_failing_items(run_with_db):
+    """Test rows rejected by the database are reported and the rest are kept."""
+    crud = CRUDBase(Contact)
+
+    async def test(db):
+        items = _contacts(5)
+        items[3] = ContactCreate(email="c1@example.com", name="Duplicate")
+        result = await crud.create_many(db, objs_in=items, batch_size=2)
+        assert [error["index"] for error in result.errors] == [3]
+        assert "UNIQUE" in result.errors[0]["error"]
+        assert await _emails(db) == ["c0@example.com", "c1@example.com", "c2@example.com", "c4@example.com"]
+
+    run_with_db(test, TestBase.metadata, savepoints=True)
+
+def test_update_many(run_with_db):
+    """Test updates are applied by id and unknown ids are reported."""
+    crud = CRUDBase(Contact)
+
+    async def test(db):
+        created = sorted((await crud.create_many(db, objs_in=_contacts(3))).items, key=lambda contact: contact.id)
+        result = await crud.update_many(db, objs_in={
+            created[0].id: ContactUpdate(name="First"),
+            999: {"name": "Nobody"},
+            created[2].id: {"email": "c0@example.com"},
+            created[1].id: {"name": "Second"},
+        })
+        assert sorted(contact.name for contact in result.items) == ["First", "Second"]
+        assert [error["index"] for error in result.errors] == [1, 2]
+        assert result.errors[0]["error"] == "Item not found"
+        names = (await db.execute(select(Contact.name).order_by(Contact.id))).scalars().all()
+        assert names == ["First", "Second", "Contact 2"]
+
+    run_with_db(test, TestBase.metadata, savepoints=True)
+
+def test_upsert_many(run_with_db):
+    """Test existing rows are updated on their unique key and new ones inserted."""
+    crud = CRUDBase(Contact)
+
+    async def test(db):
+        await crud.create_many(db, objs_in=_contacts(2))
+        result = await crud.upsert_many(
+            db,
+            objs_in=[ContactCreate(email="c1@example.com", name="Renamed"), *_contacts(1, start=2)],
+            index_elements=["email"]
+        )
+        assert result.errors == []
+        assert sorted(contact.name for contact in result.items) == ["Contact 2", "Renamed"]
+        assert await _emails(db) == ["c0@example.com", "c1@example.com", "c2@example.com"]
+        assert len([s for s in db.statements if "ON CONFLICT" in s]) == 1
+
+    run_with_db(test, TestBase.metadata, savepoints=True)
+
+def test_upsert_many_mixes_column_sets(run_with_db):
+    """Test items of schemas with different fields are upserted in the same batch."""
+    crud = CRUDBase(Contact)
+
+    async def test(db):
+        await crud.create_many(db, objs_in=_contacts(1))
+        result = await crud.upsert_many(
+            db,
+            objs_in=[
+                ContactCreate(email="c0@example.com", name="Renamed"),
+                ContactWithId(id=50, email="c50@example.com", name="Contact 50"),
+            ],
+            index_elements=["email"]
+        )
+        assert result.errors == []
+        assert sorted((contact.id, contact.name) for contact in result.items) == [(1, "Renamed"), (50, "Contact 50")]
+
+    run_with_db(test, TestBase.metadata, savepoints=True)
+
+def test_upsert_many_without_on_conflict(run_with_db, monkeypatch):
+    """Test dialects without INSERT ... ON CONFLICT upsert row by row, reporting failing items."""
+    monkeypatch.delitem(base.UPSERT_INSERTS, "sqlite")
+    crud = CRUDBase(Contact)
+
+    async def test(db):
+        created = (await crud.create_many(db, objs_in=_contacts(2))).items
+        result = await crud.upsert_many(
+            db,
+            objs_in=[
+                ContactCreate(email="c1@example.com", name="Renamed"),
+                ContactWithId(id=created[0].id, email="c9@example.com", name="Taken id"),
+                *_contacts(1, start=2),
+            ],
+            index_elements=["email"]
+        )
+        assert [error["index"] for error in result.errors] == [1]
+        assert sorted(contact.name for contact in result.items) == ["Contact 2", "Renamed"]
+        assert await _emails(db) == ["c0@example.com", "c1@example.com", "c2@example.com"]
+        names = (await db.execute(select(Contact.name).order_by(Contact.id))).scalars().all()
+        assert names == ["Contact 0", "Renamed", "Contact 2"]
+
+    run_with_db(test, TestBase.metadata, savepoints=True)
+
+def test_batch_size_must_be_positive(run_with_db):
+    """Test empty or negative batches are rejected before anything is written."""
+    crud = CRUDBase(Contact)
+
+    async def test(db):
+        for batch_size in (0, -1):
+            with pytest.raises(ValueError):
+                await crud.create_many(db, objs_in=_contacts(3), batch_size=batch_size)
+        assert await _emails(db) == []
+
+    run_with_db(test, TestBase.metadata, savepoints=True)
+
+def test_bulk_writes_refresh_entity_cache(run_with_db):
+    """Test written rows reach the entity cache."""
+    crud = CRUDBase(Contact, cache_ttl=60)
+
+    async def test(db):
+        created = (await crud.create_many(db, objs_in=_contacts(2))).items
+        assert loads(await get_cached_data(crud._cache_key(created[0].id)))["email"] == created[0].email
+        await crud.update_many(db, objs_in={created[1].id: {"name": "Cached"}})
+        assert loads(await get_cached_data(crud._cache_key(created[1].id)))["name"] == "Cached"
+
+    run_with_db(test, TestBase.metadata, savepoints=True)
+
+def test_bulk_writes_drop_responses_tagged_with_the_table(run_with_db):
+    """Test committed bulk writes invalidate cached responses tagged with the table."""
+    crud = CRUDBase(Contact)
+
+    async def test(db):
+        await set_cached_data("mcp:v1:contacts", ["c0@example.com"], 60, ["contacts"])
+        result = await crud.create_many(db, objs_in=_contacts(3))
+        assert await get_cached_data("mcp:v1:contacts") is None
+
+        await set_cached_data("mcp:v1:contacts", ["c0@example.com"], 60, ["contacts"])
+        await crud.update_many(db, objs_in={result.items[0].id: {"name": "Renamed"}})
+        assert await get_cached_data("mcp:v1:contacts") is None
+
+    run_with_db(test, TestBase.metadata, savepoints=True)
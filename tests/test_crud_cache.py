@@ -0,0 +1,118 @@
+"""
+Tests for the CRUDBase entity cache.
+"""
+from datetime import datetime
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.orm import declarative_base
+
+from src.api import cache
+from src.api.crud.base import CRUDBase
+
+pytestmark = pytest.mark.usefixtures("memory_backend")
+
+TestBase = declarative_base()
+
+class Widget(TestBase):
+    """Minimal model for exercising CRUDBase."""
+    __tablename__ = "widgets"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    status = Column(String)
+    created_at = Column(DateTime, default=datetime(2024, 1, 2, 3, 4, 5))
+
+class WidgetCreate(BaseModel):
+    name: str
+    status: str = "new"
+
+def test_get_serves_cached_rows_without_queries(run_with_db):
+    """Test repeated lookups by id are answered from the entity cache."""
+    crud = CRUDBase(Widget, cache_ttl=60)
+
+    async def test(db):
+        created = await crud.create(db, obj_in=WidgetCreate(name="gear"))
+        db.expunge_all()
+        db.statements.clear()
+
+        widget = await crud.get(db, created.id)
+        assert widget.name == "gear"
+        assert widget.created_at == datetime(2024, 1, 2, 3, 4, 5)
+        assert await crud.get(db, created.id) is widget
+        assert db.statements == []
+
+    run_with_db(test, TestBase.metadata)
+
+def test_update_and_remove_keep_cache_in_sync(run_with_db):
+    """Test writes refresh the cached row and deletes drop it."""
+    crud = CRUDBase(Widget, cache_ttl=60)
+
+    async def test(db):
+        widget = await crud.create(db, obj_in=WidgetCreate(name="gear"))
+        await crud.update(db, db_obj=widget, obj_in={"status": "active"})
+        db.expunge_all()
+        assert (await crud.get(db, widget.id)).status == "active"
+
+        await crud.remove(db, id=widget.id)
+        db.expunge_all()
+        assert await crud.get(db, widget.id) is None
+
+    run_with_db(test, TestBase.metadata)
+
+def test_writes_drop_responses_tagged_with_the_table(run_with_db):
+    """Test create, update and remove invalidate cached responses tagged with the table."""
+    crud = CRUDBase(Widget)
+
+    async def cached_response():
+        await cache.set_cached_data("mcp:v1:stats", {"widgets": 1}, 60, ["widgets"])
+        await cache.set_cached_data("mcp:v1:other", {"gadgets": 1}, 60, ["gadgets"])
+
+    async def test(db):
+        await cached_response()
+        widget = await crud.create(db, obj_in=WidgetCreate(name="gear"))
+        assert await cache.get_cached_data("mcp:v1:stats") is None
+        assert await cache.get_cached_data("mcp:v1:other") is not None
+
+        await cached_response()
+        await crud.update(db, db_obj=widget, obj_in={"status": "active"})
+        assert await cache.get_cached_data("mcp:v1:stats") is None
+
+        await cached_response()
+        await crud.remove(db, id=widget.id)
+        assert await cache.get_cached_data("mcp:v1:stats") is None
+
+    run_with_db(test, TestBase.metadata)
+
+def test_missing_ids_are_negatively_cached(run_with_db):
+    """Test repeated probes for a missing id query the database once."""
+    crud = CRUDBase(Widget, cache_ttl=60)
+
+    async def test(db):
+        assert await crud.get(db, 1) is None
+        assert await crud.get(db, 1) is None
+        assert len(db.statements) == 1
+
+        created = await crud.create(db, obj_in=WidgetCreate(name="gear"))
+        assert created.id == 1
+        db.expunge_all()
+        assert await crud.get(db, 1) is not None
+
+    run_with_db(test, TestBase.metadata)
+
+def test_cache_is_opt_in(run_with_db):
+    """Test models without a TTL always query the database."""
+    crud = CRUDBase(Widget)
+
+    async def test(db):
+        created = await crud.create(db, obj_in=WidgetCreate(name="gear"))
+        db.expunge_all()
+        db.statements.clear()
+        await crud.get(db, created.id)
+        db.expunge_all()
+        await crud.get(db, created.id)
+        assert len(db.statements) == 2
+        assert list(cache.backend.keys()) == []
+
+    run_with_db(test, TestBase.metadata)
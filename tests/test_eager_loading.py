@@ -0,0 +1,116 @@
+"""
+Tests for eager-loading relationships through CRUDBase load=.
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy.orm import declarative_base, relationship
+
+from src.api.crud.base import CRUDBase
+
+TestBase = declarative_base()
+
+# lazy="raise" turns any relationship access that was not eager-loaded into an error
+
+class Client(TestBase):
+    """Client with deals and proposals."""
+    __tablename__ = "clients"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    deals = relationship("Deal", back_populates="client", lazy="raise")
+    proposals = relationship("Proposal", back_populates="client", lazy="raise")
+
+class Deal(TestBase):
+    """Deal of a client, with proposals."""
+    __tablename__ = "deals"
+
+    id = Column(Integer, primary_key=True)
+    client_id = Column(Integer, ForeignKey("clients.id"))
+    client = relationship("Client", back_populates="deals", lazy="raise")
+    proposals = relationship("Proposal", back_populates="deal", lazy="raise")
+
+class Proposal(TestBase):
+    """Proposal for a deal."""
+    __tablename__ = "proposals"
+
+    id = Column(Integer, primary_key=True)
+    client_id = Column(Integer, ForeignKey("clients.id"))
+    deal_id = Column(Integer, ForeignKey("deals.id"))
+    client = relationship("Client", back_populates="proposals", lazy="raise")
+    deal = relationship("Deal", back_populates="proposals", lazy="raise")
+
+LOAD_PROFILES = {"detail": ["deals", "deals.proposals", "proposals"]}
+
+# Client n has n deals with two proposals each
+DEALS = [(n, n * 100 + i) for n in range(1, 21) for i in range(n)]
+SEED = {
+    Client.__table__: [{"id": n, "name": f"Client {n}"} for n in range(1, 21)],
+    Deal.__table__: [{"id": id, "client_id": n} for n, id in DEALS],
+    Proposal.__table__: [{"client_id": n, "deal_id": id} for n, id in DEALS for _ in range(2)],
+}
+
+pytestmark = pytest.mark.usefixtures("memory_backend")
+
+def test_client_with_deals_query_count_is_constant(run_with_db):
+    """Test loading a client with deals and proposals takes the same queries for 1 or 20 deals."""
+    crud = CRUDBase(Client, cache_ttl=60, load_profiles=LOAD_PROFILES)
+
+    async def test(sessions):
+        counts = []
+        for client_id in (1, 20):
+            del sessions.statements[:]
+            async with sessions() as db:
+                client = await crud.get(db, client_id, load="detail")
+                assert len(client.deals) == client_id
+                assert sum(len(deal.proposals) for deal in client.deals) == 2 * client_id
+                assert len(client.proposals) == 2 * client_id
+            counts.append(len(sessions.statements))
+        assert counts == [4, 4]
+
+    run_with_db(test, TestBase.metadata, SEED, sessions=True)
+
+def test_get_multi_and_get_page_eager_load(run_with_db):
+    """Test lists load relationships with one query per relationship, not per row."""
+    crud = CRUDBase(Client, load_profiles=LOAD_PROFILES)
+
+    async def test(sessions):
+        async with sessions() as db:
+            clients = await crud.get_multi(db, load=["deals", "deals.proposals"])
+            assert sum(len(client.deals) for client in clients) == 210
+            assert all(len(deal.proposals) == 2 for client in clients for deal in client.deals)
+            assert len(sessions.statements) == 3
+
+            del sessions.statements[:]
+            page = await crud.get_page(db, limit=5, sort_keys=("id",), load="detail")
+            assert [len(client.deals) for client in page.items] == [20, 19, 18, 17, 16]
+            assert len(sessions.statements) == 4
+
+    run_with_db(test, TestBase.metadata, SEED, sessions=True)
+
+def test_many_to_one_is_joined(run_with_db):
+    """Test many-to-one relationships load in the same query."""
+    crud = CRUDBase(Proposal)
+
+    async def test(sessions):
+        async with sessions() as db:
+            proposals = await crud.get_multi(db, limit=10, load=["deal", "deal.client"])
+            names = {proposal.deal.client.name for proposal in proposals}
+            assert names == {"Client 1", "Client 2", "Client 3"}
+            assert len(sessions.statements) == 1
+            assert "JOIN" in sessions.statements[0]
+
+    run_with_db(test, TestBase.metadata, SEED, sessions=True)
+
+def test_unknown_relationship_is_a_bad_request(run_with_db):
+    """Test load paths must name relationships."""
+    crud = CRUDBase(Client)
+
+    async def test(sessions):
+        async with sessions() as db:
+            for load in (["owner"], ["deals.missing"], ["name"]):
+                with pytest.raises(HTTPException) as exc:
+                    await crud.get_multi(db, load=load)
+                assert exc.value.status_code == 400
+
+    run_with_db(test, TestBase.metadata, SEED, sessions=True)
@@ -0,0 +1,103 @@
+"""
+Tests for streaming exports.
+"""
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import Column, Computed, DateTime, Integer, String
+from sqlalchemy.orm import declarative_base
+
+from src.api import export
+from src.api.crud.base import CRUDBase
+from src.api.export import export_response
+
+TestBase = declarative_base()
+
+class Order(TestBase):
+    """Row with a filter column, a timestamp and a generated column."""
+    __tablename__ = "orders"
+
+    id = Column(Integer, primary_key=True)
+    status = Column(String)
+    created_at = Column(DateTime)
+    label = Column(String, Computed("status || '-' || id"))
+
+CREATED = datetime(2024, 1, 1, 12, 30)
+
+# Inserted in reverse so key order differs from insertion order
+SEED = {Order.__table__: [
+    {"id": i, "status": "won" if i % 5 == 0 else "new", "created_at": CREATED} for i in range(25, 0, -1)
+]}
+
+async def _body(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+def test_stream_rows_in_key_order_with_filters(run_with_db):
+    """Test rows stream as dicts in primary key order, filtered like get_by_*."""
+    crud = CRUDBase(Order)
+
+    async def test(db):
+        rows = [row async for row in crud.stream_rows(db, batch_size=4)]
+        assert [row["id"] for row in rows] == list(range(1, 26))
+        # Generated columns are left out
+        assert rows[0] == {"id": 1, "status": "new", "created_at": CREATED}
+        won = [row["id"] async for row in crud.stream_rows(db, filters={"status": "won"})]
+        assert won == [5, 10, 15, 20, 25]
+        assert not db.identity_map
+
+    run_with_db(test, TestBase.metadata, SEED)
+
+def test_ndjson_export(run_with_db, monkeypatch):
+    """Test NDJSON is sent in chunks of rows, one JSON object per line."""
+    monkeypatch.setattr(export, "EXPORT_CHUNK_ROWS", 10)
+    crud = CRUDBase(Order)
+
+    async def test(db):
+        response = export_response(
+            crud.stream_rows(db), ["id", "status", "created_at"], format="ndjson", filename="orders"
+        )
+        chunks = [chunk async for chunk in response.body_iterator]
+        assert [chunk.count(b"\n") for chunk in chunks] == [10, 10, 5]
+        first = json.loads(chunks[0].splitlines()[0])
+        assert first == {"id": 1, "status": "new", "created_at": CREATED.isoformat()}
+        assert response.media_type == "application/x-ndjson"
+        assert response.headers["content-disposition"] == 'attachment; filename="orders.ndjson"'
+
+    run_with_db(test, TestBase.metadata, SEED)
+
+def test_csv_export(run_with_db):
+    """Test CSV has a header line and one line per row, also when empty."""
+    crud = CRUDBase(Order)
+    columns = ["id", "status", "created_at"]
+
+    async def test(db):
+        body = await _body(export_response(
+            crud.stream_rows(db, filters={"status": "won"}), columns, format="csv", filename="orders"
+        ))
+        rows = list(csv.reader(io.StringIO(body.decode())))
+        assert rows[0] == columns
+        assert rows[1] == ["5", "won", CREATED.isoformat()]
+        assert len(rows) == 6
+
+        empty = await _body(export_response(
+            crud.stream_rows(db, filters={"status": "lost"}), columns, format="csv", filename="orders"
+        ))
+        assert empty.decode().splitlines() == ["id,status,created_at"]
+
+    run_with_db(test, TestBase.metadata, SEED)
+
+def test_gzip_export(run_with_db):
+    """Test gzip output is compressed on the fly and decodes to the plain export."""
+    crud = CRUDBase(Order)
+    columns = ["id", "status", "created_at"]
+
+    async def test(db):
+        plain = await _body(export_response(crud.stream_rows(db), columns, format="csv", filename="orders"))
+        response = export_response(crud.stream_rows(db), columns, format="csv", filename="orders", gzip=True)
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(await _body(response)) == plain
+
+    run_with_db(test, TestBase.metadata, SEED)
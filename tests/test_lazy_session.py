@@ -0,0 +1,92 @@
+"""
+Tests for lazily created database sessions.
+"""
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.api import database
+from src.api.database import READ_ONLY, LazySession, get_async_db, get_async_read_db
+from src.api.pool_metrics import InstrumentedAsyncQueuePool
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    """Instrumented pool behind the session dependencies."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'lazy.db'}",
+        poolclass=InstrumentedAsyncQueuePool
+    )
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+    return engine.pool
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/cached")
+    async def cached(db=Depends(get_async_db)):
+        return {"cached": True}
+
+    @app.get("/query")
+    async def query(db=Depends(get_async_db)):
+        return {"value": (await db.execute(text("SELECT 1"))).scalar()}
+
+    @app.get("/read-only")
+    async def read_only(db=Depends(get_async_read_db)):
+        return {"read_only": db.info.get(READ_ONLY, False)}
+
+    return TestClient(app)
+
+def test_unused_session_is_never_created(pool, monkeypatch):
+    """Test a request that never touches the session neither creates it nor uses the pool."""
+    created = []
+    factory = database.AsyncSessionLocal
+    monkeypatch.setattr(database, "AsyncSessionLocal", lambda **kwargs: created.append(kwargs) or factory(**kwargs))
+    with _client() as client:
+        assert client.get("/cached").json() == {"cached": True}
+        assert created == []
+        client.get("/query")
+        assert len(created) == 1
+    assert pool.stats.checkouts == 1
+
+def test_session_is_created_and_closed_on_use(pool):
+    """Test the first query checks out a connection that is returned afterwards."""
+    with _client() as client:
+        assert client.get("/query").json() == {"value": 1}
+    assert pool.stats.checkouts == 1
+    assert pool.checkedout() == 0
+
+def test_session_options_are_kept(pool):
+    """Test the read-only flag reaches the lazily created session."""
+    with _client() as client:
+        assert client.get("/read-only").json() == {"read_only": True}
+
+def test_proxy_creates_session_once():
+    """Test attribute access creates the session on demand, once."""
+    created = []
+
+    class Session:
+        def __init__(self, **kwargs):
+            created.append(kwargs)
+            self.info = kwargs.get("info", {})
+
+    db = LazySession(Session, info={"flag": 1})
+    assert not db.session_started
+    assert db.info == {"flag": 1}
+    assert db.info == {"flag": 1}
+    assert db.session_started
+    assert created == [{"info": {"flag": 1}}]
+
+def test_fork_opens_a_new_session_without_the_response():
+    """Test forks keep the session options but not the request's response."""
+    class Session:
+        def __init__(self, **kwargs):
+            self.info = kwargs.get("info", {})
+
+    db = LazySession(Session, info={READ_ONLY: True, database.RESPONSE: object()})
+    db.info
+    fork = db.fork()
+    assert not fork.session_started
+    assert fork.info == {READ_ONLY: True}
+    assert fork._session is not db._session
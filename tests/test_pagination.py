@@ -0,0 +1,94 @@
+"""
+Tests for keyset (cursor) pagination.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy.orm import declarative_base
+
+from src.api.crud.base import CRUDBase
+from src.api.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+TestBase = declarative_base()
+
+class Entry(TestBase):
+    """Row with a (created_at, id) sort key."""
+    __tablename__ = "entries"
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer)
+    created_at = Column(DateTime)
+
+START = datetime(2024, 1, 1)
+
+# Entries come in pairs sharing a created_at, so ids break ties
+SEED = {Entry.__table__: [
+    {"id": i, "owner_id": i % 2, "created_at": START + timedelta(minutes=i // 2)}
+    for i in range(1, 26)
+]}
+
+async def _all_pages(crud, db, **kwargs):
+    ids, cursor = [], None
+    while True:
+        page = await crud.get_page(db, cursor=cursor, **kwargs)
+        ids.append([entry.id for entry in page.items])
+        if page.next_cursor is None:
+            return ids
+        cursor = page.next_cursor
+
+def test_pages_walk_newest_first_by_key(run_with_db):
+    """Test pages cover every row once, newest first, seeking by sort key."""
+    crud = CRUDBase(Entry)
+
+    async def test(db):
+        pages = await _all_pages(crud, db, limit=10)
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert sum(pages, []) == list(range(25, 0, -1))
+        assert len([s for s in db.statements if "(entries.created_at, entries.id) < (?, ?)" in s]) == 2
+
+    run_with_db(test, TestBase.metadata, SEED)
+
+def test_inserts_between_pages_cause_no_duplicates(run_with_db):
+    """Test rows inserted after the first page neither repeat nor skip rows."""
+    crud = CRUDBase(Entry)
+
+    async def test(db):
+        first = await crud.get_page(db, limit=10)
+        db.add(Entry(id=100, owner_id=0, created_at=START + timedelta(days=1)))
+        await db.commit()
+        second = await crud.get_page(db, cursor=first.next_cursor, limit=10)
+        assert [entry.id for entry in second.items] == list(range(15, 5, -1))
+
+    run_with_db(test, TestBase.metadata, SEED)
+
+def test_filters_sort_keys_and_direction(run_with_db):
+    """Test filters apply and other sort keys and ascending order are supported."""
+    crud = CRUDBase(Entry)
+
+    async def test(db):
+        pages = await _all_pages(crud, db, limit=5, filters={"owner_id": 1}, sort_keys=("id",), descending=False)
+        assert sum(pages, []) == list(range(1, 26, 2))
+
+    run_with_db(test, TestBase.metadata, SEED)
+
+def test_invalid_cursor_is_a_bad_request(run_with_db):
+    """Test tampered or foreign cursors are rejected with 400."""
+    crud = CRUDBase(Entry)
+
+    async def test(db):
+        for cursor in ["not-a-cursor!", encode_cursor([1]), encode_cursor(["yesterday", 1])]:
+            with pytest.raises(HTTPException) as exc:
+                await crud.get_page(db, cursor=cursor)
+            assert exc.value.status_code == 400
+
+    run_with_db(test, TestBase.metadata, SEED)
+
+def test_cursor_round_trip():
+    """Test cursors are opaque and restore typed sort key values."""
+    cursor = encode_cursor([START, 7])
+    assert "2024" not in cursor
+    assert decode_cursor(cursor, [Entry.created_at, Entry.id]) == [START, 7]
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, [Entry.id])
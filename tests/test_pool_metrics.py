@@ -0,0 +1,41 @@
+"""
+Tests for connection pool instrumentation.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.api.pool_metrics import InstrumentedQueuePool, pool_status
+
+def test_pool_records_checkouts_and_timeouts(tmp_path):
+    """Test checkouts, occupancy and timeouts are counted."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05
+    )
+    first = engine.connect()
+    second = engine.connect()
+    status = pool_status(engine.pool)
+    assert status["checked_out"] == 2
+    assert status["overflow"] == 1
+    assert status["checkouts"] == 2
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    status = pool_status(engine.pool)
+    assert status["timeouts"] == 1
+    assert status["wait_seconds_max"] >= 0.05
+
+    first.close()
+    second.close()
+    assert pool_status(engine.pool)["peak_checked_out"] == 2
+
+def test_pool_stats_survive_dispose(tmp_path):
+    """Test counters are kept when the engine recreates its pool."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool)
+    engine.connect().close()
+    engine.dispose()
+    assert pool_status(engine.pool)["checkouts"] == 1
@@ -0,0 +1,93 @@
+"""
+Tests for per-request SQL instrumentation.
+"""
+import logging
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.api.query_metrics import QueryMetricsMiddleware, instrument_engine, statement_shape
+
+def _app(tmp_path, queries: int, dev_mode: bool = True) -> FastAPI:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}")
+    instrument_engine(engine.sync_engine)
+    app = FastAPI()
+    app.add_middleware(QueryMetricsMiddleware, n_plus_one_threshold=3, dev_mode=dev_mode)
+
+    @app.get("/items")
+    async def items():
+        async with engine.connect() as conn:
+            for item_id in range(queries):
+                await conn.execute(text(f"SELECT {item_id}"))
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            async with engine.connect() as conn:
+                for item_id in range(queries):
+                    yield str((await conn.execute(text(f"SELECT {item_id}"))).scalar()).encode()
+
+        return StreamingResponse(body())
+
+    return app
+
+def test_server_timing_reports_query_count(tmp_path):
+    """Test the response carries the number of queries and DB time."""
+    response = TestClient(_app(tmp_path, queries=2)).get("/items")
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert 'desc="2 queries"' in timing
+    assert timing.startswith("db;dur=")
+
+def test_streamed_responses_log_queries_without_server_timing(tmp_path, caplog):
+    """Test queries run while the body streams are logged, and no partial header is sent."""
+    with caplog.at_level(logging.INFO, logger="src.api.query_metrics"):
+        response = TestClient(_app(tmp_path, queries=2, dev_mode=False)).get("/stream")
+    assert response.content == b"01"
+    assert "server-timing" not in response.headers
+    assert [r.sql["query_count"] for r in caplog.records] == [2]
+
+def test_repeated_statements_trigger_n_plus_one_warning(tmp_path, caplog):
+    """Test a statement shape repeated past the threshold is reported in dev mode."""
+    with caplog.at_level(logging.INFO, logger="src.api.query_metrics"):
+        TestClient(_app(tmp_path, queries=5)).get("/items")
+    warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert warnings[0].sql["repeated_query"] == "SELECT ?"
+    assert warnings[0].sql["repeat_count"] == 5
+    summary = [r for r in caplog.records if r.levelno == logging.INFO]
+    assert summary[0].sql["query_count"] == 5
+
+def test_no_n_plus_one_warning_outside_dev_mode(tmp_path, caplog):
+    """Test the N+1 alert is only raised in development."""
+    with caplog.at_level(logging.INFO, logger="src.api.query_metrics"):
+        TestClient(_app(tmp_path, queries=5, dev_mode=False)).get("/items")
+    assert not [r for r in caplog.records if r.levelno == logging.WARNING]
+
+def test_failed_statements_do_not_leak_start_times():
+    """Test a statement that raises leaves no start time behind on the connection."""
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+        assert conn.info["query_start_time"] == []
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start_time"] == []
+    engine.dispose()
+
+def test_statement_shape_ignores_values():
+    """Test literals and IN lists are normalized."""
+    assert statement_shape("SELECT * FROM deals WHERE id = 5 AND name = 'x'") == (
+        "SELECT * FROM deals WHERE id = ? AND name = ?"
+    )
+    assert statement_shape("SELECT * FROM deals\n WHERE id IN ($1, $2, $3)") == (
+        "SELECT * FROM deals WHERE id IN (?)"
+    )
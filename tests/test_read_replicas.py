@@ -0,0 +1,135 @@
+"""
+Tests for read-replica routing.
+"""
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, String, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+
+from src.api import database
+from src.api.database import (
+    READ_ONLY,
+    READ_YOUR_WRITES_COOKIE,
+    ReplicaSet,
+    RoutingSession,
+    get_async_db,
+    get_async_read_db,
+    use_primary
+)
+
+TestBase = declarative_base()
+
+class Node(TestBase):
+    """Row recording which database it lives in."""
+    __tablename__ = "nodes"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+async def _routing_factory(tmp_path):
+    """Routing session factory over a primary and two replicas, and its engines."""
+    engines = {}
+    for name in ("primary", "replica1", "replica2"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(TestBase.metadata.create_all)
+            await conn.execute(Node.__table__.insert().values(id=1, name=name))
+        engines[name] = engine
+    factory = async_sessionmaker(
+        engines["primary"],
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        replicas=ReplicaSet([engines["replica1"].sync_engine, engines["replica2"].sync_engine])
+    )
+    return factory, list(engines.values())
+
+@pytest.fixture
+def run_with_sessions(tmp_path):
+    """Run a coroutine with a routing session factory over a primary and two replicas."""
+    def run(test):
+        async def main():
+            factory, engines = await _routing_factory(tmp_path)
+            await test(factory)
+            for engine in engines:
+                await engine.dispose()
+
+        asyncio.run(main())
+
+    return run
+
+async def _names(db):
+    result = await db.execute(select(Node.name).order_by(Node.id))
+    return result.scalars().all()
+
+def test_read_only_sessions_round_robin_over_replicas(run_with_sessions):
+    """Test each read-only session reads from the next replica and sticks to it."""
+    async def test(factory):
+        async with factory(info={READ_ONLY: True}) as db:
+            assert await _names(db) == ["replica1"]
+            assert await _names(db) == ["replica1"]
+        async with factory(info={READ_ONLY: True}) as db:
+            assert await _names(db) == ["replica2"]
+
+    run_with_sessions(test)
+
+def test_read_write_sessions_use_the_primary(run_with_sessions):
+    """Test sessions that may write read from the primary, before and after writing."""
+    async def test(factory):
+        async with factory() as db:
+            assert await _names(db) == ["primary"]
+            db.add(Node(id=2, name="new"))
+            await db.commit()
+            assert await _names(db) == ["primary", "new"]
+
+    run_with_sessions(test)
+
+def test_use_primary_escape_hatch(run_with_sessions):
+    """Test use_primary sends reads of a read-only session to the primary."""
+    async def test(factory):
+        async with factory(info={READ_ONLY: True}) as db:
+            use_primary(db)
+            assert await _names(db) == ["primary"]
+
+    run_with_sessions(test)
+
+def test_read_only_session_rejects_writes(run_with_sessions):
+    """Test read-only sessions cannot flush changes."""
+    async def test(factory):
+        async with factory(info={READ_ONLY: True}) as db:
+            assert await _names(db) == ["replica1"]
+            db.add(Node(id=2, name="new"))
+            with pytest.raises(InvalidRequestError):
+                await db.flush()
+
+    run_with_sessions(test)
+
+def test_reads_after_a_commit_use_the_primary(tmp_path, monkeypatch):
+    """Test a commit makes the client's next read-only requests read from the primary."""
+    factory, engines = asyncio.run(_routing_factory(tmp_path))
+    monkeypatch.setattr(database, "AsyncSessionLocal", factory)
+    app = FastAPI()
+
+    @app.post("/nodes")
+    async def create(db=Depends(get_async_db)):
+        db.add(Node(id=2, name="new"))
+        await db.commit()
+
+    @app.get("/nodes")
+    async def read(db=Depends(get_async_read_db)):
+        return await _names(db)
+
+    with TestClient(app) as client:
+        assert client.get("/nodes").json() == ["replica1"]
+        response = client.post("/nodes")
+        assert READ_YOUR_WRITES_COOKIE in response.cookies
+        assert client.get("/nodes").json() == ["primary", "new"]
+        client.cookies.clear()
+        assert client.get("/nodes").json() == ["replica2"]
+
+    for engine in engines:
+        asyncio.run(engine.dispose())